@@ -1,12 +1,16 @@
 import os
 import sys
-import yaml
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from mahjong_sim.strategies import TempoDefender, ValueChaser
-from mahjong_sim.real_mc import simulate_custom_table
+from mahjong_sim.config import load_config
+from mahjong_sim.real_mc import simulate_custom_table, PER_PLAYER_METRICS
+from mahjong_sim.fan_calculator import MAX_FAN
 from mahjong_sim.players import NeutralPolicy
-from mahjong_sim.plotting import ensure_dir, save_bar_plot, save_hist, save_scatter_plot, save_kde_plot, save_stacked_fan_distribution
 from mahjong_sim.utils import compare_strategies
+from mahjong_sim.result_cache import results_cache_key, load_results, save_results
+from mahjong_sim.parallel import (resolve_num_workers, trial_seeds, seed_trial, run_parallel,
+                                  init_worker_state, worker_state)
 
 # Add project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -14,140 +18,173 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 
-def build_players(test_strategy, test_label, cfg, neutral_thresholds=None):
+def build_test_strategy(test_label, cfg):
     """
-    Build 4-player table with 2v2 configuration:
-    - 2 test players (DEF or AGG)
-    - 2 neutral players (NEU)
-    This provides a more balanced and fair comparison.
+    Build the strategy object for the tested players.
+    TempoDefender is used for DEF, ValueChaser for AGG.
     """
+    # Get strategy thresholds and weights from config
+    strategy_cfg = cfg.get("strategy_thresholds", {})
+    weights_cfg = cfg.get("scoring_weights", {})
+    # Merge hand completion and post-discard weights into weights_cfg
+    hand_completion_weights = cfg.get("hand_completion_weights", {})
+    post_discard_weights = cfg.get("post_discard_weights", {})
+    weights_cfg = {**weights_cfg, **hand_completion_weights, **post_discard_weights}
+
+    if test_label == "DEF":
+        return TempoDefender(thresholds=strategy_cfg.get("tempo_defender", {}), weights=weights_cfg)
+    return ValueChaser(target_threshold=cfg["t_fan_threshold"],
+                       thresholds=strategy_cfg.get("value_chaser", {}),
+                       weights=weights_cfg)
+
+
+# Number of tested players for each supported table layout (rest are NEU)
+TABLE_LAYOUTS = {"2v2": 2, "1v3": 1}
+
+
+def get_table_layout(cfg):
+    """
+    Read experiment.table_layout from config ("2v2" by default).
+
+    Raises:
+        ValueError: If the layout is not one of TABLE_LAYOUTS
+    """
+    layout = cfg.get("experiment", {}).get("table_layout", "2v2")
+    if layout not in TABLE_LAYOUTS:
+        raise ValueError(f"table_layout must be one of {list(TABLE_LAYOUTS)}, got {layout!r}")
+    return layout
+
+
+def build_players(test_strategy, test_label, cfg, neutral_thresholds=None, neutral_seeds=None, layout="2v2"):
+    """
+    Build 4-player table for the given layout:
+    - "2v2": 2 test players (DEF or AGG) + 2 neutral players (NEU)
+    - "1v3": 1 test player + 3 neutral players
+    Test players always occupy the first seats.
+    neutral_seeds optionally gives one RNG seed per neutral player.
+    """
+    num_test_players = TABLE_LAYOUTS[layout]
     players = [
-        {
-            "strategy": test_strategy,
-            "strategy_type": test_label
-        },
         {
             "strategy": test_strategy,
             "strategy_type": test_label
         }
+        for _ in range(num_test_players)
     ]
-    for _ in range(2):
+    for i in range(4 - num_test_players):
         players.append({
-            "strategy": NeutralPolicy(seed=None, thresholds=neutral_thresholds),
+            "strategy": NeutralPolicy(seed=None if neutral_seeds is None else int(neutral_seeds[i]),
+                                      thresholds=neutral_thresholds),
             "strategy_type": "NEU"
         })
     return players
 
 
-def summarize_trials(players_builder, cfg):
+def _run_one_trial(args):
     """
-    Summarize trials for 2v2 configuration.
-    Aggregates statistics from both test players (positions 0 and 1).
-    Also collects neutral players' fan distribution for total wins calculation.
+    Run a single trial for the configured table layout (executed in a worker process).
+
+    Returns only the averaged test-player scalars and the fan lists,
+    not the full table result, to keep inter-process traffic small.
     """
-    profits = []
-    win_rates = []
-    deal_in_rates = []
-    mean_fans = []
-    fan_distributions = []
-    neu_fan_distributions = []
-
-    for _ in range(cfg["trials"]):
-        players = players_builder()
-        table_result = simulate_custom_table(players, cfg)
-        # Aggregate stats from both test players (positions 0 and 1)
-        tested_stats_0 = table_result["per_player"][0]
-        tested_stats_1 = table_result["per_player"][1]
-        
-        # Average the two test players' stats
-        profits.append((tested_stats_0["profit"] + tested_stats_1["profit"]) / 2)
-        win_rates.append((tested_stats_0["win_rate"] + tested_stats_1["win_rate"]) / 2)
-        deal_in_rates.append((tested_stats_0["deal_in_rate"] + tested_stats_1["deal_in_rate"]) / 2)
-        mean_fans.append((tested_stats_0["mean_fan"] + tested_stats_1["mean_fan"]) / 2)
-        
-        # Collect fan distribution from both test players
-        if "fan_distribution" in tested_stats_0:
-            fan_distributions.extend(tested_stats_0["fan_distribution"])
-        if "fan_distribution" in tested_stats_1:
-            fan_distributions.extend(tested_stats_1["fan_distribution"])
-        
-        # Collect fan distribution from neutral players (positions 2 and 3)
-        for i in [2, 3]:
-            if i < len(table_result["per_player"]):
-                neu_stats = table_result["per_player"][i]
-                if "fan_distribution" in neu_stats:
-                    neu_fan_distributions.extend(neu_stats["fan_distribution"])
+    test_label, seeds = args
+    cfg = worker_state["cfg"]
+    test_strategy = worker_state["test_strategies"][test_label]
+    # seeds[0] drives the tile walls, seeds[1:] the neutral players
+    seed_trial(seeds[0])
+    neutral_thresholds = cfg.get("strategy_thresholds", {}).get("neutral_policy", {})
+    layout = get_table_layout(cfg)
+    players = build_players(test_strategy, test_label, cfg, neutral_thresholds,
+                            neutral_seeds=seeds[1:], layout=layout)
+    table_result = simulate_custom_table(players, cfg)
+    # Test players sit first, neutral players fill the remaining seats
+    num_test_players = TABLE_LAYOUTS[layout]
+    tested_stats = table_result["per_player"][:num_test_players]
+    neutral_stats = table_result["per_player"][num_test_players:]
 
+    # Average the test players' stats (columns follow PER_PLAYER_METRICS)
     return {
-        "profits": np.array(profits),
-        "win_rates": np.array(win_rates),
-        "deal_in_rates": np.array(deal_in_rates),
-        "mean_fans": np.array(mean_fans),
-        "fan_distribution": np.array(fan_distributions) if fan_distributions else np.array([]),
-        "neu_fan_distribution": np.array(neu_fan_distributions) if neu_fan_distributions else np.array([]),
+        "metrics": table_result["per_player_metrics"][:num_test_players].mean(axis=0),
+        # Fan histograms of test players and neutral players
+        "fan_histogram": sum(stats["fan_histogram"] for stats in tested_stats),
+        "neu_fan_histogram": sum(stats["fan_histogram"] for stats in neutral_stats)
+    }
+
+
+def _aggregate_trials(trial_results):
+    """
+    Combine per-trial results of one strategy into arrays and overall means.
+    """
+    # One row per trial, columns follow PER_PLAYER_METRICS
+    metrics = np.empty((len(trial_results), len(PER_PLAYER_METRICS)), dtype=np.float64)
+    fan_histogram = np.zeros(MAX_FAN + 1, dtype=np.int64)
+    neu_fan_histogram = np.zeros(MAX_FAN + 1, dtype=np.int64)
+
+    for i, trial in enumerate(trial_results):
+        metrics[i] = trial["metrics"]
+        fan_histogram += trial["fan_histogram"]
+        neu_fan_histogram += trial["neu_fan_histogram"]
+
+    profit, win_rate, deal_in_rate, mean_fan = metrics.mean(axis=0)
+    return {
+        "profits": metrics[:, 0],
+        "win_rates": metrics[:, 1],
+        "deal_in_rates": metrics[:, 2],
+        "mean_fans": metrics[:, 3],
+        # Rounds binned by fan value (index = fan, 0 = no win)
+        "fan_histogram": fan_histogram,
+        "neu_fan_histogram": neu_fan_histogram,
         # Also return means for backward compatibility
-        "profit": np.mean(profits),
-        "win_rate": np.mean(win_rates),
-        "deal_in_rate": np.mean(deal_in_rates),
-        "mean_fan": np.mean(mean_fans)
+        "profit": profit,
+        "win_rate": win_rate,
+        "deal_in_rate": deal_in_rate,
+        "mean_fan": mean_fan
     }
 
 
-def main():
-    config_path = os.path.join(project_root, "configs", "base.yaml")
-    with open(config_path) as f:
-        cfg = yaml.safe_load(f)
+def summarize_strategies(test_labels, cfg):
+    """
+    Summarize trials for several tested strategies in one parallel sweep.
 
-    print("=" * 60)
-    print("Experiment 1: Strategy Performance (4-player table)")
-    print("Configuration: 2 test players vs 2 neutral players (2v2)")
-    print("=" * 60)
-    
-    num_trials = cfg.get("trials")
-    if num_trials is None:
-        raise ValueError("trials must be specified in config")
-    rounds_per_trial = cfg.get("rounds_per_trial")
-    if rounds_per_trial is None:
-        raise ValueError("rounds_per_trial must be specified in config")
-    num_strategies = 2  # DEF and AGG
-    total_trials = num_trials * num_strategies
-    total_rounds = total_trials * rounds_per_trial
-    
-    print(f"\nRunning {num_trials} trials per strategy ({num_strategies} strategies)")
-    print(f"Each trial consists of {rounds_per_trial} rounds")
-    print(f"Table composition: 2 test players vs 2 neutral players")
-    print(f"Total trials: {total_trials}")
-    print(f"Total rounds: {total_rounds}\n")
+    All len(test_labels) * trials jobs go to a single process pool
+    (cfg["num_workers"]) and results are routed back by label, so the pool
+    stays busy even when one strategy's trials cannot fill every core.
+    Trial i uses the same seed for every strategy (common random numbers).
 
-    fan_min = cfg["fan_min"]
-    t_fan_threshold = cfg["t_fan_threshold"]
-    
-    # Get strategy thresholds and weights from config
-    strategy_cfg = cfg.get("strategy_thresholds", {})
-    weights_cfg = cfg.get("scoring_weights", {})
-    # Merge hand completion and post-discard weights into weights_cfg
-    hand_completion_weights = cfg.get("hand_completion_weights", {})
-    post_discard_weights = cfg.get("post_discard_weights", {})
-    weights_cfg = {**weights_cfg, **hand_completion_weights, **post_discard_weights}
-    tempo_thresholds = strategy_cfg.get("tempo_defender", {})
-    value_thresholds = strategy_cfg.get("value_chaser", {})
-    neutral_thresholds = strategy_cfg.get("neutral_policy", {})
+    Returns:
+        Dict mapping each label to its summarize_trials result
+    """
+    # One row per trial: table seed followed by up to 3 neutral-player seeds
+    seeds = trial_seeds(cfg, cfg["trials"], seeds_per_trial=4)
+    # Test strategies are stateless, so one instance is shared by every trial;
+    # only the neutral players (which carry RNG state) are rebuilt per trial
+    test_strategies = {test_label: build_test_strategy(test_label, cfg) for test_label in test_labels}
+    # Tasks are just (label, seeds); cfg and strategies reach workers once
+    tasks = [(test_label, seed) for test_label in test_labels for seed in seeds]
+    trial_results = run_parallel(_run_one_trial, tasks, resolve_num_workers(cfg),
+                                 initializer=init_worker_state,
+                                 initargs=({"cfg": cfg, "test_strategies": test_strategies},))
 
-    def def_builder():
-        # Use TempoDefender strategy class for defensive play
-        test_strategy = TempoDefender(thresholds=tempo_thresholds, weights=weights_cfg)
-        return build_players(test_strategy, "DEF", cfg, neutral_thresholds)
+    by_label = {test_label: [] for test_label in test_labels}
+    for (test_label, _), trial in zip(tasks, trial_results):
+        by_label[test_label].append(trial)
+    return {test_label: _aggregate_trials(trials) for test_label, trials in by_label.items()}
 
-    def agg_builder():
-        # Use ValueChaser strategy class for aggressive play
-        test_strategy = ValueChaser(target_threshold=t_fan_threshold, 
-                                   thresholds=value_thresholds, 
-                                   weights=weights_cfg)
-        return build_players(test_strategy, "AGG", cfg, neutral_thresholds)
 
-    def_results = summarize_trials(def_builder, cfg)
-    agg_results = summarize_trials(agg_builder, cfg)
+def summarize_trials(test_label, cfg):
+    """
+    Summarize trials for the configured table layout (2v2 by default).
+    Aggregates statistics from the test players (the first seats).
+    Also collects neutral players' fan distribution for total wins calculation.
+
+    Trials are independent, so they are spread over a process pool
+    (cfg["num_workers"]); each trial gets its own seed derived from cfg["seed"].
+    """
+    return summarize_strategies([test_label], cfg)[test_label]
+
 
+def print_results(def_results, agg_results):
+    """Print per-strategy averages and the DEF vs AGG profit comparison."""
     print("\nDefensive Strategy Results:")
     print("  (All values are averages across all trials)")
     print(f"  Profit: {def_results['profit']:.2f}")
@@ -162,20 +199,9 @@ def main():
     print(f"  Deal-in Rate: {agg_results['deal_in_rate']:.4f}")
     print(f"  Mean Fan: {agg_results['mean_fan']:.2f}")
 
-    # Statistical comparison
-    results_def_for_comparison = {
-        "profits": def_results["profits"],
-        "win_rates": def_results["win_rates"],
-        "mean_fans": def_results["mean_fans"]
-    }
-    results_agg_for_comparison = {
-        "profits": agg_results["profits"],
-        "win_rates": agg_results["win_rates"],
-        "mean_fans": agg_results["mean_fans"]
-    }
-    
-    comparison = compare_strategies(results_def_for_comparison, results_agg_for_comparison)
-    
+    # Statistical comparison (Welch t-test on per-trial profits)
+    comparison = compare_strategies(def_results["profits"], agg_results["profits"])
+
     print("\n" + "-" * 60)
     print("PROFIT COMPARISON:")
     print("-" * 60)
@@ -186,8 +212,78 @@ def main():
     print(f"p-value: {comparison['profit']['p_value']:.6f}")
 
     print("\n" + "=" * 60)
+
+
+def load_or_summarize_strategies(test_labels, cfg, cache_dir, force=False):
+    """
+    summarize_strategies with an on-disk cache per strategy.
+
+    Results are keyed on (cfg, strategy class, source mtime); only labels
+    without a cache entry (or all of them if force=True) are simulated.
+    """
+    keys = {
+        test_label: results_cache_key(cfg, type(build_test_strategy(test_label, cfg)), os.path.abspath(__file__))
+        for test_label in test_labels
+    }
+    results = {}
+    if not force:
+        for test_label, key in keys.items():
+            cached = load_results(cache_dir, key)
+            if cached is not None:
+                print(f"Loaded cached {test_label} results ({key})")
+                results[test_label] = cached
+
+    missing = [test_label for test_label in test_labels if test_label not in results]
+    if missing:
+        fresh = summarize_strategies(missing, cfg)
+        for test_label in missing:
+            save_results(cache_dir, keys[test_label], fresh[test_label])
+        results.update(fresh)
+    return results
+
+
+def main(force=False):
+    """
+    Run Experiment 1.
+
+    Args:
+        force: Ignore cached simulation results and re-run every strategy
+    """
+    config_path = os.path.join(project_root, "configs", "base.yaml")
+    cfg = load_config(config_path)
+
+    print("=" * 60)
+    print("Experiment 1: Strategy Performance (4-player table)")
+    layout = get_table_layout(cfg)
+    num_test_players = TABLE_LAYOUTS[layout]
+    print(f"Configuration: {num_test_players} test player(s) vs {4 - num_test_players} neutral players ({layout})")
+    print("=" * 60)
     
-    # Generate plots
+    num_trials = cfg.get("trials")
+    if num_trials is None:
+        raise ValueError("trials must be specified in config")
+    rounds_per_trial = cfg.get("rounds_per_trial")
+    if rounds_per_trial is None:
+        raise ValueError("rounds_per_trial must be specified in config")
+    num_strategies = 2  # DEF and AGG
+    total_trials = num_trials * num_strategies
+    total_rounds = total_trials * rounds_per_trial
+    
+    print(f"\nRunning {num_trials} trials per strategy ({num_strategies} strategies)")
+    print(f"Each trial consists of {rounds_per_trial} rounds")
+    print(f"Table composition: {num_test_players} test player(s) vs {4 - num_test_players} neutral players")
+    print(f"Total trials: {total_trials}")
+    print(f"Total rounds: {total_rounds}\n")
+
+    cache_dir = os.path.join(project_root, "output", "cache")
+    results = load_or_summarize_strategies(["DEF", "AGG"], cfg, cache_dir, force=force)
+    def_results = results["DEF"]
+    agg_results = results["AGG"]
+
+    # Generate plots in background processes while the statistics are printed
+    # (plotting pulls in matplotlib, so it is only imported once results exist)
+    from mahjong_sim.plotting import (ensure_dir, save_bar_plot, save_hist, save_scatter_plot,
+                                      save_kde_plot, save_stacked_fan_histogram)
     plot_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "plots", "experiment_1")
     ensure_dir(plot_dir)
     
@@ -195,45 +291,54 @@ def main():
     # Calculate relative advantage: DEF advantage = DEF - AGG, AGG advantage = AGG - DEF
     def_advantage = def_results['profit'] - agg_results['profit']
     agg_advantage = agg_results['profit'] - def_results['profit']
-    save_bar_plot(
-        ["DEF", "AGG"],
-        [def_advantage, agg_advantage],
-        "Relative Advantage: Defensive vs Aggressive Strategy",
-        os.path.join(plot_dir, "profit_comparison.png"),
-        ylabel="Relative Advantage"
-    )
     
     # Bar chart: Actual number of wins (DEF vs AGG)
-    # Calculate actual wins from fan_distribution (each non-zero fan represents a win)
-    def_wins = len([f for f in def_results['fan_distribution'] if f > 0]) if len(def_results['fan_distribution']) > 0 else 0
-    agg_wins = len([f for f in agg_results['fan_distribution'] if f > 0]) if len(agg_results['fan_distribution']) > 0 else 0
-    
-    save_bar_plot(
-        ["DEF", "AGG"],
-        [def_wins, agg_wins],
-        "Number of Wins: Defensive vs Aggressive Strategy",
-        os.path.join(plot_dir, "win_rate_comparison.png"),
-        ylabel="Number of Wins"
-    )
+    # Calculate actual wins from fan_histogram (every non-zero fan represents a win)
+    def_wins = int(def_results['fan_histogram'][1:].sum())
+    agg_wins = int(agg_results['fan_histogram'][1:].sum())
     
     # Stacked bar chart: Fan distribution separated by strategy
-    def_fans = def_results['fan_distribution'] if len(def_results['fan_distribution']) > 0 else []
-    agg_fans = agg_results['fan_distribution'] if len(agg_results['fan_distribution']) > 0 else []
-    # Collect neutral players' fan distribution from both trials (use def_results as they have same neutral players)
-    neu_fans = def_results.get('neu_fan_distribution', [])
-    if len(neu_fans) == 0:
-        neu_fans = agg_results.get('neu_fan_distribution', [])
+    # Collect neutral players' fan histogram (use def_results as they have same neutral players)
+    neu_counts = def_results['neu_fan_histogram']
+    if neu_counts[1:].sum() == 0:
+        neu_counts = agg_results['neu_fan_histogram']
+    
+    with ProcessPoolExecutor(max_workers=3) as plot_pool:
+        plot_futures = [
+            plot_pool.submit(
+                save_bar_plot,
+                ["DEF", "AGG"],
+                [def_advantage, agg_advantage],
+                "Relative Advantage: Defensive vs Aggressive Strategy",
+                os.path.join(plot_dir, "profit_comparison.png"),
+                ylabel="Relative Advantage"
+            ),
+            plot_pool.submit(
+                save_bar_plot,
+                ["DEF", "AGG"],
+                [def_wins, agg_wins],
+                "Number of Wins: Defensive vs Aggressive Strategy",
+                os.path.join(plot_dir, "win_rate_comparison.png"),
+                ylabel="Number of Wins"
+            )
+        ]
+        if def_wins > 0 or agg_wins > 0:
+            plot_futures.append(plot_pool.submit(
+                save_stacked_fan_histogram,
+                def_results['fan_histogram'],
+                agg_results['fan_histogram'],
+                "Fan Distribution by Strategy",
+                os.path.join(plot_dir, "fan_distribution.png"),
+                xlabel="Fan Value",
+                ylabel="Frequency",
+                neu_counts=neu_counts if neu_counts[1:].sum() > 0 else None
+            ))
+        
+        print_results(def_results, agg_results)
     
-    if len(def_fans) > 0 or len(agg_fans) > 0:
-        save_stacked_fan_distribution(
-            def_fans,
-            agg_fans,
-            "Fan Distribution by Strategy",
-            os.path.join(plot_dir, "fan_distribution.png"),
-            xlabel="Fan Value",
-            ylabel="Frequency",
-            neu_fans=neu_fans if len(neu_fans) > 0 else None
-        )
+    # Re-raise any plotting error
+    for future in plot_futures:
+        future.result()
     
     print(f"\nPlots saved to: {plot_dir}")
 
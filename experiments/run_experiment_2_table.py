@@ -11,6 +11,8 @@ Simulates 5 different table compositions:
 - θ=4: 4 DEF players
 """
 
+import contextlib
+import io
 import sys
 import os
 
@@ -19,17 +21,54 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-import yaml
 import numpy as np
+from mahjong_sim.config import load_config
 from mahjong_sim.real_mc import run_composition_experiments
+from mahjong_sim.parallel import resolve_num_workers
 from mahjong_sim.utils import analyze_composition_effect, compute_statistics
-from mahjong_sim.plotting import ensure_dir, save_line_plot, save_bar_plot, save_hist, save_stacked_fan_distribution
+
+# Per-θ plot data, one record per composition
+SUMMARY_DTYPE = np.dtype([
+    ("def_profit", np.float64),
+    ("agg_profit", np.float64),
+    ("dealer_profit", np.float64),
+    ("non_dealer_profit", np.float64),
+    ("def_win_rate", np.float64),
+    ("agg_win_rate", np.float64),
+])
+
+
+def build_summary(results, thetas):
+    """
+    Collect per-θ profits and win rates into a SUMMARY_DTYPE structured array.
+
+    DEF/AGG fields are 0.0 for compositions where that strategy never won
+    (including compositions without players of that type).
+
+    Args:
+        results: Output of run_composition_experiments
+        thetas: Compositions, in the order of the returned records
+    """
+    def group_fields(stats):
+        if stats["fan_histogram"][1:].sum() > 0:
+            return stats["mean_profit"], stats["win_rate"]
+        return 0.0, 0.0
+
+    records = []
+    for theta in thetas:
+        comp_results = results[theta]
+        def_profit, def_win_rate = group_fields(comp_results["defensive"])
+        agg_profit, agg_win_rate = group_fields(comp_results["aggressive"])
+        records.append((def_profit, agg_profit, comp_results["dealer"]["mean_profit"],
+                        comp_results["non_dealer"]["mean_profit"], def_win_rate, agg_win_rate))
+    return np.array(records, dtype=SUMMARY_DTYPE)
 
 
 def main():
     config_path = os.path.join(project_root, "configs", "base.yaml")
-    with open(config_path) as f:
-        cfg = yaml.safe_load(f)
+    cfg = load_config(config_path)
+    # Regression sampling RNG (PCG64); reproducible when cfg["seed"] is set
+    rng = np.random.default_rng(cfg.get("seed"))
     
     print("=" * 70)
     print("Experiment 2: 4-Player Table Composition Analysis")
@@ -57,227 +96,195 @@ def main():
     
     results = run_composition_experiments(cfg, num_trials=num_trials)
     
-    print("\n" + "=" * 70)
-    print("RESULTS BY COMPOSITION")
-    print("=" * 70)
+    # Build the report in memory and write it with a single call
+    report = io.StringIO()
+    with contextlib.redirect_stdout(report):
+        print("\n" + "=" * 70)
+        print("RESULTS BY COMPOSITION")
+        print("=" * 70)
     
-    for composition in theta_values:
-                num_def = composition
-                num_agg = 4 - composition
-                comp_results = results[composition]
+        for composition in theta_values:
+                    num_def = composition
+                    num_agg = 4 - composition
+                    comp_results = results[composition]
                 
-                print(f"\n{'='*70}")
-                print(f"Composition θ={composition}: {num_def} DEF, {num_agg} AGG")
-                print(f"{'='*70}")
+                    print(f"\n{'='*70}")
+                    print(f"Composition θ={composition}: {num_def} DEF, {num_agg} AGG")
+                    print(f"{'='*70}")
                 
-                if num_def > 0:
-                    def_stats = comp_results["defensive"]
-                    print(f"\nDEFENSIVE Players:")
-                    print("  (All values are averages across all trials)")
-                    print(f"  Mean Profit: {def_stats['mean_profit']:.2f} ± {def_stats['std_profit']:.2f}")
-                    print(f"  Win Rate: {def_stats['win_rate']:.4f}")
-                    print(f"  Deal-in Rate (as winner): {def_stats['deal_in_rate']:.4f}")
-                    print(f"  Missed Hu Rate: {def_stats['missed_hu_rate']:.4f}")
-                    print(f"  Mean Fan (when winning): {def_stats['mean_fan']:.2f}")
+                    if num_def > 0:
+                        def_stats = comp_results["defensive"]
+                        print(f"\nDEFENSIVE Players:")
+                        print("  (All values are averages across all trials)")
+                        print(f"  Mean Profit: {def_stats['mean_profit']:.2f} ± {def_stats['std_profit']:.2f}")
+                        print(f"  Win Rate: {def_stats['win_rate']:.4f}")
+                        print(f"  Deal-in Rate (as winner): {def_stats['deal_in_rate']:.4f}")
+                        print(f"  Missed Hu Rate: {def_stats['missed_hu_rate']:.4f}")
+                        print(f"  Mean Fan (when winning): {def_stats['mean_fan']:.2f}")
                 
-                if num_agg > 0:
-                    agg_stats = comp_results["aggressive"]
-                    print(f"\nAGGRESSIVE Players:")
-                    print("  (All values are averages across all trials)")
-                    print(f"  Mean Profit: {agg_stats['mean_profit']:.2f} ± {agg_stats['std_profit']:.2f}")
-                    print(f"  Win Rate: {agg_stats['win_rate']:.4f}")
-                    print(f"  Deal-in Rate (as winner): {agg_stats['deal_in_rate']:.4f}")
-                    print(f"  Missed Hu Rate: {agg_stats['missed_hu_rate']:.4f}")
-                    print(f"  Mean Fan (when winning): {agg_stats['mean_fan']:.2f}")
+                    if num_agg > 0:
+                        agg_stats = comp_results["aggressive"]
+                        print(f"\nAGGRESSIVE Players:")
+                        print("  (All values are averages across all trials)")
+                        print(f"  Mean Profit: {agg_stats['mean_profit']:.2f} ± {agg_stats['std_profit']:.2f}")
+                        print(f"  Win Rate: {agg_stats['win_rate']:.4f}")
+                        print(f"  Deal-in Rate (as winner): {agg_stats['deal_in_rate']:.4f}")
+                        print(f"  Missed Hu Rate: {agg_stats['missed_hu_rate']:.4f}")
+                        print(f"  Mean Fan (when winning): {agg_stats['mean_fan']:.2f}")
 
-                dealer_stats = comp_results["dealer"]
-                non_dealer_stats = comp_results["non_dealer"]
+                    dealer_stats = comp_results["dealer"]
+                    non_dealer_stats = comp_results["non_dealer"]
 
-                print(f"\nDEALER ROUNDS:")
-                print("  (All values are averages across all dealer rounds)")
-                print(f"  Mean Profit: {dealer_stats['mean_profit']:.2f} ± {dealer_stats['std_profit']:.2f}")
-                print(f"  Win Rate: {dealer_stats['win_rate']:.4f}")
-                print(f"  Deal-in Rate (as winner): {dealer_stats['deal_in_rate']:.4f}")
-                print(f"  Deal-in Loss Rate: {dealer_stats['deal_in_loss_rate']:.4f}")
-                print(f"  Missed Hu Rate: {dealer_stats['missed_hu_rate']:.4f}")
+                    print(f"\nDEALER ROUNDS:")
+                    print("  (All values are averages across all dealer rounds)")
+                    print(f"  Mean Profit: {dealer_stats['mean_profit']:.2f} ± {dealer_stats['std_profit']:.2f}")
+                    print(f"  Win Rate: {dealer_stats['win_rate']:.4f}")
+                    print(f"  Deal-in Rate (as winner): {dealer_stats['deal_in_rate']:.4f}")
+                    print(f"  Deal-in Loss Rate: {dealer_stats['deal_in_loss_rate']:.4f}")
+                    print(f"  Missed Hu Rate: {dealer_stats['missed_hu_rate']:.4f}")
 
-                print(f"\nNON-DEALER ROUNDS:")
-                print("  (All values are averages across all non-dealer rounds)")
-                print(f"  Mean Profit: {non_dealer_stats['mean_profit']:.2f} ± {non_dealer_stats['std_profit']:.2f}")
-                print(f"  Win Rate: {non_dealer_stats['win_rate']:.4f}")
-                print(f"  Deal-in Rate (as winner): {non_dealer_stats['deal_in_rate']:.4f}")
-                print(f"  Deal-in Loss Rate: {non_dealer_stats['deal_in_loss_rate']:.4f}")
-                print(f"  Missed Hu Rate: {non_dealer_stats['missed_hu_rate']:.4f}")
-    
-    print("\n" + "=" * 70)
-    print("REGRESSION ANALYSIS")
-    print("=" * 70)
+                    print(f"\nNON-DEALER ROUNDS:")
+                    print("  (All values are averages across all non-dealer rounds)")
+                    print(f"  Mean Profit: {non_dealer_stats['mean_profit']:.2f} ± {non_dealer_stats['std_profit']:.2f}")
+                    print(f"  Win Rate: {non_dealer_stats['win_rate']:.4f}")
+                    print(f"  Deal-in Rate (as winner): {non_dealer_stats['deal_in_rate']:.4f}")
+                    print(f"  Deal-in Loss Rate: {non_dealer_stats['deal_in_loss_rate']:.4f}")
+                    print(f"  Missed Hu Rate: {non_dealer_stats['missed_hu_rate']:.4f}")
     
-    regression_samples = experiment_cfg.get("regression_samples", 100)
-    def_profits_for_regression = {}
-    agg_profits_for_regression = {}
+        print("\n" + "=" * 70)
+        print("REGRESSION ANALYSIS")
+        print("=" * 70)
     
-    for theta in theta_values:
-                comp_results = results[theta]
-                if len(comp_results["defensive"]["fan_distribution"]) > 0:
-                    mean = comp_results["defensive"]["mean_profit"]
-                    std = comp_results["defensive"]["std_profit"]
-                    def_profits_for_regression[theta] = np.random.normal(mean, std, regression_samples)
-                
-                if len(comp_results["aggressive"]["fan_distribution"]) > 0:
-                    mean = comp_results["aggressive"]["mean_profit"]
-                    std = comp_results["aggressive"]["std_profit"]
-                    agg_profits_for_regression[theta] = np.random.normal(mean, std, regression_samples)
+        regression_samples = experiment_cfg.get("regression_samples", 100)
+        # One batched draw for both strategies and all θ: rows are (DEF, AGG),
+        # columns follow theta_values; θ without players of a type are skipped
+        group_names = ("defensive", "aggressive")
+        has_players = np.array([[results[theta][group]["fan_histogram"][1:].sum() > 0 for theta in theta_values]
+                                for group in group_names])
+        means = np.array([[results[theta][group]["mean_profit"] for theta in theta_values] for group in group_names])
+        stds = np.array([[results[theta][group]["std_profit"] for theta in theta_values] for group in group_names])
+        draws = rng.normal(means, stds, size=(regression_samples,) + means.shape)
+        def_profits_for_regression = {theta: draws[:, 0, i] for i, theta in enumerate(theta_values) if has_players[0, i]}
+        agg_profits_for_regression = {theta: draws[:, 1, i] for i, theta in enumerate(theta_values) if has_players[1, i]}
     
-    if len(def_profits_for_regression) > 1:
-        def_regression = analyze_composition_effect(
-            list(def_profits_for_regression.keys()),
-            def_profits_for_regression
-        )
-        print("\nDefensive Strategy:")
-        print(f"  Slope: {def_regression['slope']:.2f}")
-        print(f"  R-squared: {def_regression['r_squared']:.4f}")
-        print(f"  p-value: {def_regression['p_value']:.6f}")
+        if len(def_profits_for_regression) > 1:
+            def_regression = analyze_composition_effect(
+                list(def_profits_for_regression.keys()),
+                def_profits_for_regression
+            )
+            print("\nDefensive Strategy:")
+            print(f"  Slope: {def_regression['slope']:.2f}")
+            print(f"  R-squared: {def_regression['r_squared']:.4f}")
+            print(f"  p-value: {def_regression['p_value']:.6f}")
     
-    if len(agg_profits_for_regression) > 1:
-        agg_regression = analyze_composition_effect(
-            list(agg_profits_for_regression.keys()),
-            agg_profits_for_regression
-        )
-        print("\nAggressive Strategy:")
-        print(f"  Slope: {agg_regression['slope']:.2f}")
-        print(f"  R-squared: {agg_regression['r_squared']:.4f}")
-        print(f"  p-value: {agg_regression['p_value']:.6f}")
+        if len(agg_profits_for_regression) > 1:
+            agg_regression = analyze_composition_effect(
+                list(agg_profits_for_regression.keys()),
+                agg_profits_for_regression
+            )
+            print("\nAggressive Strategy:")
+            print(f"  Slope: {agg_regression['slope']:.2f}")
+            print(f"  R-squared: {agg_regression['r_squared']:.4f}")
+            print(f"  p-value: {agg_regression['p_value']:.6f}")
     
-    print("\n" + "=" * 70)
-    print("SUMMARY TABLE")
-    print("=" * 70)
-    print(f"\n{'θ':<5} {'DEF Profit':<15} {'AGG Profit':<15} {'Dealer Profit':<15} {'NonDealer Profit':<17}")
-    print("-" * 70)
+        print("\n" + "=" * 70)
+        print("SUMMARY TABLE")
+        print("=" * 70)
+        print(f"\n{'θ':<5} {'DEF Profit':<15} {'AGG Profit':<15} {'Dealer Profit':<15} {'NonDealer Profit':<17}")
+        print("-" * 70)
     
-    for theta in sorted(theta_values):
-        comp_results = results[theta]
-        # Show mean_profit directly - it's already 0.0 if no players of that type
-        def_profit = comp_results["defensive"]["mean_profit"]
-        agg_profit = comp_results["aggressive"]["mean_profit"]
-        dealer_profit = comp_results["dealer"]["mean_profit"]
-        non_dealer_profit = comp_results["non_dealer"]["mean_profit"]
+        for theta in sorted(theta_values):
+            comp_results = results[theta]
+            # Show mean_profit directly - it's already 0.0 if no players of that type
+            def_profit = comp_results["defensive"]["mean_profit"]
+            agg_profit = comp_results["aggressive"]["mean_profit"]
+            dealer_profit = comp_results["dealer"]["mean_profit"]
+            non_dealer_profit = comp_results["non_dealer"]["mean_profit"]
         
-        print(f"{theta:<5} {def_profit:<15.2f} {agg_profit:<15.2f} {dealer_profit:<15.2f} {non_dealer_profit:<17.2f}")
+            print(f"{theta:<5} {def_profit:<15.2f} {agg_profit:<15.2f} {dealer_profit:<15.2f} {non_dealer_profit:<17.2f}")
     
-    print("\n" + "=" * 70)
-    print("INTERPRETATION")
-    print("=" * 70)
+        print("\n" + "=" * 70)
+        print("INTERPRETATION")
+        print("=" * 70)
     
-    if len(agg_profits_for_regression) > 1:
-        if agg_regression['slope'] > 0:
-            print("\nAggressive strategy profit INCREASES as θ increases")
-            print("   (More defensive opponents → Better aggressive performance)")
-        else:
-            print("\nAggressive strategy profit DECREASES as θ increases")
-            print("   (More defensive opponents → Worse aggressive performance)")
+        if len(agg_profits_for_regression) > 1:
+            if agg_regression['slope'] > 0:
+                print("\nAggressive strategy profit INCREASES as θ increases")
+                print("   (More defensive opponents → Better aggressive performance)")
+            else:
+                print("\nAggressive strategy profit DECREASES as θ increases")
+                print("   (More defensive opponents → Worse aggressive performance)")
     
-    print("\n" + "=" * 70)
+        print("\n" + "=" * 70)
+    sys.stdout.write(report.getvalue())
     
-    # Generate plots
+    # Generate plots (plotting pulls in matplotlib, so it is imported only here)
+    from mahjong_sim.plotting import ensure_dir, save_line_plot, save_bar_plot, save_stacked_fan_histogram, save_many
     plot_dir = os.path.join(project_root, "plots", "experiment_2")
     ensure_dir(plot_dir)
 
     # Extract data for plotting
-    def_profits = []
-    agg_profits = []
-    def_win_rates = []
-    agg_win_rates = []
-    dealer_profits = []
-    non_dealer_profits = []
-    all_def_fans = []
-    all_agg_fans = []
-    
-    for theta in sorted(theta_values):
-        comp_results = results[theta]
-        if len(comp_results["defensive"]["fan_distribution"]) > 0:
-            def_profits.append(comp_results["defensive"]["mean_profit"])
-            def_win_rates.append(comp_results["defensive"]["win_rate"])
-        else:
-            def_profits.append(0.0)
-            def_win_rates.append(0.0)
-        
-        if len(comp_results["aggressive"]["fan_distribution"]) > 0:
-            agg_profits.append(comp_results["aggressive"]["mean_profit"])
-            agg_win_rates.append(comp_results["aggressive"]["win_rate"])
-        else:
-            agg_profits.append(0.0)
-            agg_win_rates.append(0.0)
-        
-        dealer_profits.append(comp_results["dealer"]["mean_profit"])
-        non_dealer_profits.append(comp_results["non_dealer"]["mean_profit"])
-        
-        # Collect fan distributions separately for DEF and AGG
-        all_def_fans.extend([f for f in comp_results["defensive"]["fan_distribution"] if f > 0])
-        all_agg_fans.extend([f for f in comp_results["aggressive"]["fan_distribution"] if f > 0])
-    
-    # θ vs Profit (DEF vs AGG) - Combined plot only
-    save_line_plot(
-        theta_values,
-        def_profits,
-        "Profit vs Composition (θ): Both Strategies",
-        "θ (Number of DEF Players)",
-        "Mean Profit",
-        os.path.join(plot_dir, "profit_vs_theta_combined.png"),
-        y2=agg_profits,
-        label1="Defensive",
-        label2="Aggressive"
-    )
-    
-    # θ vs Win Rate
-    save_line_plot(
-        theta_values,
-        def_win_rates,
-        "Win Rate vs Composition (θ): Both Strategies",
-        "θ (Number of DEF Players)",
-        "Win Rate",
-        os.path.join(plot_dir, "win_rate_vs_theta_combined.png"),
-        y2=agg_win_rates,
-        label1="Defensive",
-        label2="Aggressive"
-    )
+    thetas = sorted(theta_values)
+    summary = build_summary(results, thetas)
+    # Fan distributions collected separately for DEF and AGG
+    def_fan_histogram = np.sum([results[theta]["defensive"]["fan_histogram"] for theta in thetas], axis=0)
+    agg_fan_histogram = np.sum([results[theta]["aggressive"]["fan_histogram"] for theta in thetas], axis=0)
     
-    # Bar chart: Relative Advantage (DEF vs AGG) - average across all compositions
-    avg_def_profit = np.mean(def_profits)
-    avg_agg_profit = np.mean(agg_profits)
+    # Bar chart inputs: averages across all compositions
+    avg_def_profit = summary["def_profit"].mean()
+    avg_agg_profit = summary["agg_profit"].mean()
     def_advantage = avg_def_profit - avg_agg_profit
     agg_advantage = avg_agg_profit - avg_def_profit
-    save_bar_plot(
-        ["DEF", "AGG"],
-        [def_advantage, agg_advantage],
-        "Relative Advantage: Defensive vs Aggressive Strategy (Average Across All Compositions)",
-        os.path.join(plot_dir, "profit_comparison.png"),
-        ylabel="Relative Advantage"
-    )
-    
-    # Bar chart: Dealer vs Non-dealer profit (average across all compositions)
-    avg_dealer_profit = np.mean(dealer_profits)
-    avg_non_dealer_profit = np.mean(non_dealer_profits)
-    save_bar_plot(
-        ["Dealer", "Non-Dealer"],
-        [avg_dealer_profit, avg_non_dealer_profit],
-        "Average Profit: Dealer vs Non-Dealer",
-        os.path.join(plot_dir, "dealer_vs_non_dealer_profit.png"),
-        ylabel="Mean Profit"
-    )
+    avg_dealer_profit = summary["dealer_profit"].mean()
+    avg_non_dealer_profit = summary["non_dealer_profit"].mean()
+
+    plot_jobs = [
+        # θ vs Profit (DEF vs AGG) - Combined plot only
+        (save_line_plot, (
+            thetas,
+            summary["def_profit"],
+            "Profit vs Composition (θ): Both Strategies",
+            "θ (Number of DEF Players)",
+            "Mean Profit",
+            os.path.join(plot_dir, "profit_vs_theta_combined.png"),
+        ), {"y2": summary["agg_profit"], "label1": "Defensive", "label2": "Aggressive"}),
+        # θ vs Win Rate
+        (save_line_plot, (
+            thetas,
+            summary["def_win_rate"],
+            "Win Rate vs Composition (θ): Both Strategies",
+            "θ (Number of DEF Players)",
+            "Win Rate",
+            os.path.join(plot_dir, "win_rate_vs_theta_combined.png"),
+        ), {"y2": summary["agg_win_rate"], "label1": "Defensive", "label2": "Aggressive"}),
+        # Bar chart: Relative Advantage (DEF vs AGG) - average across all compositions
+        (save_bar_plot, (
+            ["DEF", "AGG"],
+            [def_advantage, agg_advantage],
+            "Relative Advantage: Defensive vs Aggressive Strategy (Average Across All Compositions)",
+            os.path.join(plot_dir, "profit_comparison.png"),
+        ), {"ylabel": "Relative Advantage"}),
+        # Bar chart: Dealer vs Non-dealer profit (average across all compositions)
+        (save_bar_plot, (
+            ["Dealer", "Non-Dealer"],
+            [avg_dealer_profit, avg_non_dealer_profit],
+            "Average Profit: Dealer vs Non-Dealer",
+            os.path.join(plot_dir, "dealer_vs_non_dealer_profit.png"),
+        ), {"ylabel": "Mean Profit"}),
+    ]
     
     # Stacked bar chart: Overall fan distribution separated by strategy
-    # Note: Experiment 2 has no neutral players (pure DEF vs AGG), so neu_fans=None
-    if len(all_def_fans) > 0 or len(all_agg_fans) > 0:
-        save_stacked_fan_distribution(
-            all_def_fans,
-            all_agg_fans,
+    # Note: Experiment 2 has no neutral players (pure DEF vs AGG), so neu_counts=None
+    if def_fan_histogram[1:].sum() > 0 or agg_fan_histogram[1:].sum() > 0:
+        plot_jobs.append((save_stacked_fan_histogram, (
+            def_fan_histogram,
+            agg_fan_histogram,
             "Overall Fan Distribution by Strategy (All Compositions)",
             os.path.join(plot_dir, "fan_distribution.png"),
-            xlabel="Fan Value",
-            ylabel="Frequency",
-            neu_fans=None  # Experiment 2 has no neutral players
-        )
+        ), {"xlabel": "Fan Value", "ylabel": "Frequency", "neu_counts": None}))
+    
+    # The plots are independent, so they are rendered in parallel
+    save_many(plot_jobs, resolve_num_workers(cfg))
             
     print(f"\nPlots saved to: {plot_dir}")
 
@@ -0,0 +1,65 @@
+"""
+Optional Numba acceleration.
+
+Numba is not a hard dependency: when it is missing, ``njit`` is a no-op
+decorator and the kernels run as plain Python. The backend used by the
+simulation is selected through cfg["accel"]:
+- "auto": use Numba if it is installed, otherwise plain Python (default)
+- "numba": require Numba
+- "python": never use Numba
+"""
+
+from typing import Any, Dict
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - depends on environment
+    numba = None
+    HAS_NUMBA = False
+
+ACCEL_BACKENDS = ("auto", "numba", "python")
+
+_backend = "python"
+
+
+def njit(*args, **kwargs):
+    """
+    numba.njit when Numba is installed, otherwise an identity decorator.
+
+    Supports both ``@njit`` and ``@njit(cache=True)`` forms.
+    """
+    if HAS_NUMBA:
+        return numba.njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda fn: fn
+
+
+def resolve_accel(cfg: Dict[str, Any]) -> str:
+    """
+    Resolve cfg["accel"] to a concrete backend ("numba" or "python").
+
+    Raises:
+        ValueError: If the accel option is unknown
+        ImportError: If "numba" is requested but Numba is not installed
+    """
+    accel = cfg.get("accel", "auto") or "auto"
+    if accel not in ACCEL_BACKENDS:
+        raise ValueError(f"accel must be one of {ACCEL_BACKENDS}, got {accel!r}")
+    if accel == "numba" and not HAS_NUMBA:
+        raise ImportError("accel='numba' requires the numba package")
+    if accel == "auto":
+        return "numba" if HAS_NUMBA else "python"
+    return accel
+
+
+def set_backend(backend: str) -> None:
+    """Select the kernel backend for this process ("numba" or "python")."""
+    global _backend
+    _backend = backend
+
+
+def get_backend() -> str:
+    """Kernel backend currently selected for this process."""
+    return _backend
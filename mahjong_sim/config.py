@@ -0,0 +1,125 @@
+"""
+Configuration loading and the compiled simulation config.
+"""
+
+import copy
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+from .accel import resolve_accel
+
+# In-process LRU of parsed configs: abspath -> (mtime, size, cfg)
+_CONFIG_CACHE: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+_CONFIG_CACHE_SIZE = 100
+
+
+def _read_json_cache(cache_path: str) -> Dict[str, Any]:
+    """Read a JSON config cache (orjson if installed, stdlib json otherwise)."""
+    with open(cache_path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _write_json_cache(cache_path: str, cfg: Dict[str, Any]) -> None:
+    """Write the JSON config cache; failures (e.g. read-only dir) are ignored."""
+    data = orjson.dumps(cfg) if orjson is not None else json.dumps(cfg).encode("utf-8")
+    try:
+        with open(cache_path, "wb") as f:
+            f.write(data)
+    except OSError:
+        pass
+
+
+def _parse_yaml(path: str) -> Dict[str, Any]:
+    """
+    Parse a YAML file, with the libyaml-backed CSafeLoader when available.
+
+    yaml is imported here because a fresh JSON cache makes it unnecessary.
+    """
+    import yaml
+    try:
+        loader = yaml.CSafeLoader
+    except AttributeError:  # pragma: no cover - PyYAML built without libyaml
+        loader = yaml.SafeLoader
+    with open(path) as f:
+        return yaml.load(f, Loader=loader)
+
+
+def _load_config_uncached(path: str) -> Dict[str, Any]:
+    """Load config from the JSON cache next to the YAML file, or parse the YAML."""
+    cache_path = path + ".json.cache"
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            return _read_json_cache(cache_path)
+    except (OSError, ValueError):
+        pass  # No cache yet, or unreadable: fall back to YAML
+    cfg = _parse_yaml(path)
+    _write_json_cache(cache_path, cfg)
+    return cfg
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """
+    Load the YAML configuration file.
+
+    The parsed config is cached as JSON next to the YAML file
+    (<path>.json.cache) and reused while it is newer than the YAML, since
+    JSON parses much faster than YAML. Within a process, loads are also
+    memoized on (path, mtime, size); callers get a deep copy, so mutating
+    the returned dict is safe.
+
+    Args:
+        path: Path to the YAML config (e.g. configs/base.yaml)
+
+    Returns:
+        Configuration dictionary
+    """
+    key = os.path.abspath(path)
+    st = os.stat(path)
+    hit = _CONFIG_CACHE.get(key)
+    if hit is not None and hit[0] == st.st_mtime and hit[1] == st.st_size:
+        _CONFIG_CACHE.move_to_end(key)
+        return copy.deepcopy(hit[2])
+    cfg = _load_config_uncached(path)
+    _CONFIG_CACHE[key] = (st.st_mtime, st.st_size, cfg)
+    if len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+        _CONFIG_CACHE.popitem(last=False)
+    return copy.deepcopy(cfg)
+
+
+@dataclass(frozen=True, slots=True)
+class SimConfig:
+    """
+    Scalar parameters read by the simulation hot loop.
+
+    Built once per RealMCSimulation from the config dict so that per-turn
+    code uses attribute reads instead of repeated cfg.get() lookups.
+    """
+    base_points: float = 1
+    fan_min: int = 1
+    t_fan_threshold: int = 3
+    penalty_deal_in: float = 1
+    risk_max_denominator: int = 100
+    accel: str = "python"
+
+    @classmethod
+    def from_dict(cls, cfg: Dict[str, Any]) -> "SimConfig":
+        """Compile the relevant keys of a config dict (missing keys use defaults)."""
+        return cls(
+            base_points=cfg.get("base_points", 1),
+            fan_min=cfg.get("fan_min", 1),
+            t_fan_threshold=cfg.get("t_fan_threshold", 3),
+            penalty_deal_in=cfg.get("penalty_deal_in", 1),
+            risk_max_denominator=cfg.get("risk_calculation", {}).get("max_denominator", 100),
+            accel=resolve_accel(cfg),
+        )
@@ -2,10 +2,45 @@
 Fan (points) calculation for winning Mahjong hands.
 """
 
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
 from typing import List, Tuple
-from collections import Counter
-from .tiles import Tile, TileType
+
+import numpy as np
+
+from .tiles import Tile, NUM_TILE_KINDS
 from .hand import Hand
+from .kernels import (meld_features, FEATURE_TRIPLETS, FEATURE_SEQUENCES,
+                      FEATURE_MIXED_CHI, FEATURE_LITTLE_DRAGONS)
+
+# Fan cap for a single hand; fan histograms use MAX_FAN + 1 bins (index = fan)
+MAX_FAN = 16
+
+# Entries kept by the per-process calculate_fan cache
+FAN_CACHE_SIZE = 100_000
+
+# Tile.index positions of terminals (1/9 of each suit) and honors
+TERMINAL_INDICES = np.array([0, 8, 9, 17, 18, 26])
+SUIT_SLICES = (slice(0, 9), slice(9, 18), slice(18, 27))
+HONOR_SLICE = slice(27, NUM_TILE_KINDS)
+
+
+@dataclass(frozen=True, slots=True)
+class _MeldSummary:
+    """
+    Everything the fan checks need, extracted from a winning hand once.
+
+    suits_present is a bitmask over wan (1), tiao (2) and tong (4).
+    """
+    num_triplets: int
+    num_sequences: int
+    has_mixed_triple_chi: bool
+    has_little_dragons: bool
+    suits_present: int
+    has_honors: bool
+    has_terminals: bool
+    gong_count: int
 
 
 class FanCalculator:
@@ -16,27 +51,43 @@ class FanCalculator:
         """
         Calculate total fan for winning hand.
         
+        Fan is a pure function of the hand's tile counts, the exposed melds
+        and is_self_draw, so results are memoized on that fingerprint; see
+        FanCalculator._calculate_fan_cached.cache_info() for hit rates.
+        Hand tiles are always kept in index order, so keying on the count
+        vector avoids building the tiles list just for the key.
+        
         Args:
             hand: The winning hand
             is_self_draw: Whether win was self-draw
             is_dealer: Whether winner is dealer
         """
+        meld_ids = tuple(tuple(tile.index for tile in meld) for meld in hand.melds)
+        return FanCalculator._calculate_fan_cached(bytes(hand.counts), meld_ids, is_self_draw, is_dealer)
+    
+    @staticmethod
+    @lru_cache(maxsize=FAN_CACHE_SIZE)
+    def _calculate_fan_cached(counts_key: bytes, meld_ids: Tuple[Tuple[int, ...], ...],
+                              is_self_draw: bool, is_dealer: bool) -> int:
+        """Rebuild the hand from its fingerprint and calculate fan (cache miss path)."""
+        hand = Hand()
+        hand.set_tiles(Tile.from_index(index) for index, count in enumerate(counts_key)
+                       for _ in range(count))
+        hand.melds = [tuple(Tile.from_index(index) for index in meld) for meld in meld_ids]
+        return FanCalculator._calculate_fan(hand, is_self_draw, is_dealer)
+    
+    @staticmethod
+    def _calculate_fan(hand: Hand, is_self_draw: bool, is_dealer: bool) -> int:
+        """Calculate total fan for winning hand (uncached, see calculate_fan)."""
         fan = 0
         
-        # Get all tiles in hand
-        all_tiles = hand.tiles.copy()
-        for meld in hand.melds:
-            all_tiles.extend(meld)
-        
-        tile_counts = Counter(all_tiles)
-        
         # Get winning pattern structure
         is_winning, winning_melds = hand.check_winning_hand()
         if not is_winning:
             return 0  # Invalid hand
         
-        # Analyze meld structure
-        triplets, sequences = FanCalculator._analyze_melds(hand, winning_melds)
+        summary = FanCalculator._summarize(hand, winning_melds)
+        is_concealed = len(hand.melds) == 0
         
         # ===== 1. Basic Hand — 1 Fan Each =====
         
@@ -49,63 +100,43 @@ class FanCalculator:
         # For concealed hand, we check if there are any melds at all
         # Actually, if melds exist, they are exposed (Pong from discard)
         # So concealed hand means no melds
-        if len(hand.melds) == 0:
+        if is_concealed:
             fan += 1
         
         # (3) All simples — 1 fan
         # No terminals (1 or 9) and no honors
-        if FanCalculator._is_all_simples(all_tiles):
+        if FanCalculator._is_all_simples(summary):
             fan += 1
         
         # ===== 2. Common Wins — 2 Fan Each =====
         
         # (4) All pongs — 2 fan
         # Hand consists of four pong sets and one pair
-        if len(triplets) == 4 and len(sequences) == 0:
+        if summary.num_triplets == 4 and summary.num_sequences == 0:
             fan += 2
         
         # (5) Mixed triple chi — 2 fan
-        # Same numbered chi appears in all three suits
-        if FanCalculator._has_mixed_triple_chi(hand, winning_melds):
+        # Same numbered chi appears in all three suits (so needs all three suits)
+        if summary.suits_present == 7 and FanCalculator._has_mixed_triple_chi(summary):
             fan += 2
         
         # ===== 3. Advanced Hands — 4–6 Fan Each =====
         
-        # (6) Pure flush — 4–6 fan
-        # Whole hand uses tiles from one suit, no honors
-        pure_flush_result = FanCalculator._is_pure_flush(all_tiles, len(hand.melds) == 0)
-        if pure_flush_result:
-            fan += pure_flush_result  # 4 fan if exposed, 6 fan if concealed
-        
-        # (7) Little dragons — 4–6 fan
-        # Two dragon pongs + pair made from the remaining dragon
-        little_dragons_result = FanCalculator._is_little_dragons(hand, winning_melds)
-        if little_dragons_result:
-            fan += little_dragons_result  # 4 fan if exposed, 6 fan if concealed
+        # Pure flush excludes honors and little dragons needs them, so at most
+        # one of the two checks can apply (most hands have neither)
+        if not summary.has_honors:
+            # (6) Pure flush — 4–6 fan
+            # Whole hand uses tiles from one suit, no honors
+            fan += FanCalculator._is_pure_flush(summary, is_concealed)  # 4 fan if exposed, 6 fan if concealed
+        else:
+            # (7) Little dragons — 4–6 fan
+            # Two dragon pongs + pair made from the remaining dragon
+            fan += FanCalculator._is_little_dragons(summary, is_concealed)  # 4 fan if exposed, 6 fan if concealed
         
         # ===== 4. Add-on Bonuses — +1 to +2 Fan =====
         
         # (8) Gong — +1 fan per gong
-        # Count gongs (4-tile melds)
-        # Gongs can be in hand.melds (exposed) or in winning_melds (concealed from hand tiles)
-        gong_count = 0
-        # Count exposed gongs (in hand.melds)
-        for meld in hand.melds:
-            if len(meld) == 4:
-                gong_count += 1
-        # Count concealed gongs (in winning_melds but not in hand.melds)
-        # A gong in winning_melds is concealed if it's not already in hand.melds
-        for meld in winning_melds:
-            if len(meld) == 4:
-                # Check if this gong is already counted in hand.melds
-                is_already_counted = False
-                for exposed_meld in hand.melds:
-                    if len(exposed_meld) == 4 and exposed_meld[0] == meld[0]:
-                        is_already_counted = True
-                        break
-                if not is_already_counted:
-                    gong_count += 1
-        fan += gong_count  # +1 fan per gong
+        fan += summary.gong_count
         
         # (9) "Gong open" win — +1 fan
         # This is handled by checking if the winning tile was drawn after a gong
@@ -116,164 +147,90 @@ class FanCalculator:
         if fan == 0:
             fan = 1
         
-        # Cap at 16 fan
-        return min(fan, 16)
+        # Cap at MAX_FAN (16 fan)
+        return min(fan, MAX_FAN)
     
     @staticmethod
-    def _analyze_melds(hand: Hand, winning_melds: List[List[Tile]]) -> Tuple[List[Tile], List[List[Tile]]]:
-        """
-        Analyze melds to identify triplets and sequences.
-        Returns (list of triplet tiles, list of sequence melds)
+    def _summarize(hand: Hand, winning_melds: List[List[Tile]]) -> _MeldSummary:
         """
-        triplets = []
-        sequences = []
-        seen_triplets = set()  # Track seen triplets to avoid duplicates
-        
-        # Check all melds
-        for meld in hand.melds:
-            if len(meld) >= 3:
-                if meld[0] == meld[1] == meld[2]:
-                    # Triplet
-                    tile_key = (meld[0].tile_type, meld[0].value)
-                    if tile_key not in seen_triplets:
-                        triplets.append(meld[0])
-                        seen_triplets.add(tile_key)
-                elif (meld[0].tile_type in [TileType.WAN, TileType.TIAO, TileType.TONG] and
-                      meld[0].value + 1 == meld[1].value and
-                      meld[1].value + 1 == meld[2].value):
-                    # Sequence
-                    sequences.append(meld[:3])
-        
-        # Check winning pattern melds (from hand tiles)
-        # winning_melds contains 4 melds + 1 pair
-        for meld in winning_melds:
-            if len(meld) == 2:
-                continue  # Skip pair
-            if len(meld) >= 3:
-                if meld[0] == meld[1] == meld[2]:
-                    # Triplet
-                    tile_key = (meld[0].tile_type, meld[0].value)
-                    if tile_key not in seen_triplets:
-                        triplets.append(meld[0])
-                        seen_triplets.add(tile_key)
-                elif (meld[0].tile_type in [TileType.WAN, TileType.TIAO, TileType.TONG] and
-                      meld[0].value + 1 == meld[1].value and
-                      meld[1].value + 1 == meld[2].value):
-                    # Sequence
-                    sequences.append(meld[:3])
+        Extract the meld structure and tile-set properties of a winning hand.
         
-        return triplets, sequences
+        Args:
+            hand: The winning hand
+            winning_melds: Winning pattern (4 melds + pair) from check_winning_hand
+        """
+        # Meld structure (exposed + winning pattern melds) in one kernel pass
+        meld_ids = [[tile.index for tile in meld] for meld in hand.melds]
+        meld_ids.extend([tile.index for tile in meld] for meld in winning_melds)
+        features = meld_features(meld_ids)
+        
+        # Tile-set properties from a 34-slot count vector indexed by Tile.index,
+        # over hand tiles + exposed meld tiles
+        tile_counts = np.bincount([tile.index for tile in chain(hand.tiles, *hand.melds)],
+                                  minlength=NUM_TILE_KINDS)
+        suits_present = 0
+        for bit, suit in enumerate(SUIT_SLICES):
+            if tile_counts[suit].any():
+                suits_present |= 1 << bit
+        
+        # Gongs can be in hand.melds (exposed) or in winning_melds (concealed
+        # from hand tiles); a winning-pattern gong already exposed counts once.
+        # Concealed hands (the common case) skip the scan: the winning pattern
+        # only holds 3-tile melds and the pair.
+        gong_count = 0
+        if hand.melds:
+            exposed_gong_ids = {meld[0].index for meld in hand.melds if len(meld) == 4}
+            gong_count = sum(1 for meld in hand.melds if len(meld) == 4)
+            gong_count += sum(1 for meld in winning_melds
+                              if len(meld) == 4 and meld[0].index not in exposed_gong_ids)
+        
+        return _MeldSummary(
+            num_triplets=features[FEATURE_TRIPLETS],
+            num_sequences=features[FEATURE_SEQUENCES],
+            has_mixed_triple_chi=features[FEATURE_MIXED_CHI] == 1,
+            has_little_dragons=features[FEATURE_LITTLE_DRAGONS] == 1,
+            suits_present=suits_present,
+            has_honors=bool(tile_counts[HONOR_SLICE].any()),
+            has_terminals=bool(tile_counts[TERMINAL_INDICES].any()),
+            gong_count=gong_count,
+        )
     
     @staticmethod
-    def _is_all_simples(tiles: List[Tile]) -> bool:
+    def _is_all_simples(summary: _MeldSummary) -> bool:
         """
         Check if all tiles are simples (2-8 only, no terminals 1/9, no honors).
         """
-        if not tiles:
-            return False
-        for tile in tiles:
-            if tile.tile_type in [TileType.FENG, TileType.JIAN]:
-                return False  # Honors not allowed
-            if tile.tile_type in [TileType.WAN, TileType.TIAO, TileType.TONG]:
-                if tile.value == 1 or tile.value == 9:
-                    return False  # Terminals not allowed
-        return True
+        if not summary.suits_present:
+            return False  # No suited tiles at all (empty or all honors)
+        return not (summary.has_honors or summary.has_terminals)
     
     @staticmethod
-    def _has_mixed_triple_chi(hand: Hand, winning_melds: List[List[Tile]]) -> bool:
+    def _has_mixed_triple_chi(summary: _MeldSummary) -> bool:
         """
         Check if hand has mixed triple chi (same numbered chi in all three suits).
         Example: 4-5-6 in wan, tiao, tong
         
         Checks both exposed melds and winning pattern melds.
         """
-        sequences = []
-        
-        # Check exposed melds
-        for meld in hand.melds:
-            if len(meld) == 3:
-                if (meld[0].tile_type in [TileType.WAN, TileType.TIAO, TileType.TONG] and
-                    meld[0].value + 1 == meld[1].value and
-                    meld[1].value + 1 == meld[2].value):
-                    sequences.append((meld[0].tile_type, meld[0].value))
-        
-        # Check winning pattern melds
-        for meld in winning_melds:
-            if len(meld) == 3:
-                if (meld[0].tile_type in [TileType.WAN, TileType.TIAO, TileType.TONG] and
-                    meld[0].value + 1 == meld[1].value and
-                    meld[1].value + 1 == meld[2].value):
-                    sequences.append((meld[0].tile_type, meld[0].value))
-        
-        # Group sequences by value
-        by_value = {}
-        for suit, value in sequences:
-            if value not in by_value:
-                by_value[value] = set()
-            by_value[value].add(suit)
-        
-        # Check if any value has sequences in all three suits
-        for value, suits in by_value.items():
-            if len(suits) == 3 and TileType.WAN in suits and TileType.TIAO in suits and TileType.TONG in suits:
-                return True
-        
-        return False
+        return summary.has_mixed_triple_chi
     
     @staticmethod
-    def _is_pure_flush(tiles: List[Tile], is_concealed: bool) -> int:
+    def _is_pure_flush(summary: _MeldSummary, is_concealed: bool) -> int:
         """
         Check if hand is pure flush (all one suit, no honors).
         Returns 4 fan if exposed, 6 fan if concealed, 0 if not pure flush.
         """
-        if not tiles:
+        # Exactly one suit bit set, no honors
+        if summary.has_honors or summary.suits_present not in (1, 2, 4):
             return 0
-        
-        # Must be all from one suit (wan/tiao/tong), no honors
-        suits = set()
-        for tile in tiles:
-            if tile.tile_type in [TileType.FENG, TileType.JIAN]:
-                return 0  # Honors not allowed
-            if tile.tile_type in [TileType.WAN, TileType.TIAO, TileType.TONG]:
-                suits.add(tile.tile_type)
-        
-        if len(suits) == 1:
-            return 6 if is_concealed else 4
-        
-        return 0
+        return 6 if is_concealed else 4
     
     @staticmethod
-    def _is_little_dragons(hand: Hand, winning_melds: List[List[Tile]]) -> int:
+    def _is_little_dragons(summary: _MeldSummary, is_concealed: bool) -> int:
         """
         Check if hand is little dragons (two dragon pongs + pair of third dragon).
         Returns 4 fan if exposed, 6 fan if concealed, 0 if not little dragons.
         """
-        # Get all melds (exposed + winning pattern)
-        all_melds = hand.melds.copy()
-        all_melds.extend(winning_melds)
-        
-        # Count dragon melds and find pair
-        dragon_melds = []
-        dragon_pair = None
-        
-        for meld in all_melds:
-            if len(meld) == 2:
-                # Check if pair is a dragon
-                if meld[0].tile_type == TileType.JIAN and meld[0] == meld[1]:
-                    dragon_pair = meld[0]
-            elif len(meld) >= 3:
-                # Check if meld is a dragon triplet
-                if (meld[0].tile_type == TileType.JIAN and 
-                    meld[0] == meld[1] == meld[2]):
-                    dragon_melds.append(meld[0])
-        
-        # Need exactly 2 dragon melds and 1 dragon pair
-        if len(dragon_melds) == 2 and dragon_pair is not None:
-            # Check that the pair is the third dragon (not one of the melds)
-            used_dragons = set(dragon_melds)
-            if dragon_pair not in used_dragons:
-                # Check if concealed (no exposed melds)
-                is_concealed = len(hand.melds) == 0
-                return 6 if is_concealed else 4
-        
+        if summary.has_little_dragons:
+            return 6 if is_concealed else 4
         return 0
-
@@ -2,40 +2,72 @@
 Hand class for managing player's tiles and melds.
 """
 
-from typing import List, Tuple, Optional, Set, Dict
+from bisect import insort
+from typing import Iterable, List, Tuple, Optional, Set, Dict
 from collections import Counter
-from .tiles import Tile, TileType
+from .tiles import Tile, NUM_TILE_KINDS
+from .kernels import find_winning_pattern, is_complete_hand, SEQUENCE_OFFSET
 
 
 class Hand:
     """Player hand"""
     def __init__(self):
-        self.tiles: List[Tile] = []  # Hand tiles
-        self.melds: List[List[Tile]] = []  # All melds (Pongs, Chis, Gongs, Pair)
+        self.counts: List[int] = [0] * NUM_TILE_KINDS  # Hand tile counts indexed by Tile.index (canonical state)
+        self._tiles: Optional[List[Tile]] = []  # Sorted tile list, or None until rebuilt from counts
+        self.melds: List[Tuple[Tile, ...]] = []  # All melds (Pongs, Chis, Gongs, Pair), immutable tuples
         # Meld types:
         # - Pong (triplet): 3 tiles
         # - Chi (sequence): 3 tiles
         # - Gong (quad): 4 tiles (upgraded from Pong)
         # - Pair: 2 tiles (part of winning requirement)
         self.concealed_meld_indices: Set[int] = set()  # Indices of concealed melds (for fan calculation)
+        # First-tile index -> meld index of 3-tile melds, in meld order (what can_gong matches)
+        self._gong_candidates: Dict[int, int] = {}
         self.is_ready = False  # Ready to win
     
+    @property
+    def tiles(self) -> List[Tile]:
+        """
+        Hand tiles, sorted.
+        
+        Built from counts on first access, then kept sorted in place by
+        add_tile (binary insertion) and remove_tile. Treat the returned list
+        as read-only and use add_tile/remove_tile/set_tiles to modify the hand.
+        """
+        if self._tiles is None:
+            self._tiles = [Tile.from_index(idx)
+                           for idx, count in enumerate(self.counts) for _ in range(count)]
+        return self._tiles
+    
+    @tiles.setter
+    def tiles(self, tiles: Iterable[Tile]):
+        self.set_tiles(tiles)
+    
     def add_tile(self, tile: Tile):
         """Add tile to hand"""
-        self.tiles.append(tile)
-        self.tiles.sort()
+        self.counts[tile.index] += 1
+        if self._tiles is not None:
+            insort(self._tiles, tile)  # Keep the built list sorted instead of rebuilding it
     
     def remove_tile(self, tile: Tile) -> bool:
         """Remove tile from hand"""
-        try:
-            self.tiles.remove(tile)
-            return True
-        except ValueError:
+        if not self.counts[tile.index]:
             return False
+        self.counts[tile.index] -= 1
+        if self._tiles is not None:
+            self._tiles.remove(tile)
+        return True
+    
+    def set_tiles(self, tiles: Iterable[Tile]):
+        """Replace all hand tiles"""
+        self.counts = [0] * NUM_TILE_KINDS
+        for tile in tiles:
+            self.counts[tile.index] += 1
+        self._tiles = None
     
     def add_meld(self, meld: List[Tile], remove_from_hand: bool = False, is_concealed: bool = False):
         """
-        Add meld (creates a copy to ensure immutability).
+        Add meld (stored as a tuple, so it cannot change after it is formed).
         
         Meld can be:
         - Pong (triplet): 3 tiles
@@ -50,7 +82,9 @@ class Hand:
             is_concealed: If True, mark this meld as concealed (for fan calculation)
         """
         meld_index = len(self.melds)
-        self.melds.append(meld.copy())
+        self.melds.append(tuple(meld))
+        if len(meld) == 3:
+            self._gong_candidates.setdefault(meld[0].index, meld_index)
         # Remove tiles from hand if needed
         if remove_from_hand:
             for tile in meld:
@@ -60,15 +94,14 @@ class Hand:
             self.concealed_meld_indices.add(meld_index)
     
     def get_tile_counts(self) -> Dict[Tile, int]:
-        """Get count of each tile"""
-        return Counter(self.tiles)
+        """Get count of each tile (read from counts, in index order)"""
+        return Counter({Tile.from_index(idx): count for idx, count in enumerate(self.counts) if count})
     
     def can_pong(self, discarded_tile: Tile) -> bool:
         """
         Check if can Pong (triplet).
         """
-        count = sum(1 for t in self.tiles if t == discarded_tile)
-        return count >= 2
+        return self.counts[discarded_tile.index] >= 2
     
     def can_gong(self, tile: Tile = None) -> Optional[int]:
         """
@@ -84,58 +117,63 @@ class Hand:
         Returns:
             Index of Pong meld that can be upgraded to Gong, or None if no upgrade possible
         """
-        if tile:
+        if tile is not None:
             # Check if any existing Pong meld matches this tile
-            for i, meld in enumerate(self.melds):
-                if len(meld) == 3 and meld[0] == tile:
-                    # This Pong meld can be upgraded to Gong
-                    return i
-        else:
-            # Check hand tiles for 4th tile of any Pong meld
-            for i, meld in enumerate(self.melds):
-                if len(meld) == 3:
-                    pong_tile = meld[0]
-                    count = sum(1 for t in self.tiles if t == pong_tile)
-                    if count >= 1:
-                        # Have the 4th tile, can upgrade Pong to Gong
-                        return i
+            return self._gong_candidates.get(tile.index)
+        # Check hand tiles for 4th tile of any Pong meld
+        for tile_index, meld_index in self._gong_candidates.items():
+            if self.counts[tile_index]:
+                # Have the 4th tile, can upgrade Pong to Gong
+                return meld_index
         return None
     
-    def can_chi(self, discarded_tile: Tile) -> List[List[Tile]]:
+    def chi_starts(self, discarded_tile: Tile) -> List[int]:
         """
-        Check if can Chi (sequence) from discard.
-        
-        Chi can only be formed from discard (not self-drawn in this variant).
+        Start indices of the chi sequences the discard would complete.
         
-        Returns list of possible chi sequences.
+        Pure index arithmetic on the count vector; no tiles are built.
         """
-        chis = []
-        if discarded_tile.tile_type not in [TileType.WAN, TileType.TIAO, TileType.TONG]:
+        idx = discarded_tile.index
+        if idx >= 27:
             return []  # Only suited tiles can form chis
+        value = idx % 9  # 0-based position within the suit
+        counts = self.counts
+        starts = []
+        # Sequence ending with discard (e.g., 3-4-5, discard is 5)
+        if value >= 2 and counts[idx - 2] and counts[idx - 1]:
+            starts.append(idx - 2)
+        # Sequence with discard in middle (e.g., 4-5-6, discard is 5)
+        if 1 <= value <= 7 and counts[idx - 1] and counts[idx + 1]:
+            starts.append(idx - 1)
+        # Sequence starting with discard (e.g., 4-5-6, discard is 4)
+        if value <= 6 and counts[idx + 1] and counts[idx + 2]:
+            starts.append(idx)
+        return starts
+    
+    def upgrade_to_gong(self, meld_index: int, tile: Tile):
+        """
+        Upgrade the Pong meld at meld_index to a Gong with its 4th tile.
         
-        # Check for chi sequences (e.g., 4-5-6, need 4 and 5 or 5 and 6 or 6 and 7)
-        if discarded_tile.value >= 3:  # Can be middle or end of sequence
-            # Check for sequence ending with discard (e.g., 3-4-5, discard is 5)
-            tile_minus2 = Tile(discarded_tile.tile_type, discarded_tile.value - 2)
-            tile_minus1 = Tile(discarded_tile.tile_type, discarded_tile.value - 1)
-            if tile_minus2 in self.tiles and tile_minus1 in self.tiles:
-                chis.append([tile_minus2, tile_minus1, discarded_tile])
-        
-        if 2 <= discarded_tile.value <= 8:  # Can be middle of sequence
-            # Check for sequence with discard in middle (e.g., 4-5-6, discard is 5)
-            tile_minus1 = Tile(discarded_tile.tile_type, discarded_tile.value - 1)
-            tile_plus1 = Tile(discarded_tile.tile_type, discarded_tile.value + 1)
-            if tile_minus1 in self.tiles and tile_plus1 in self.tiles:
-                chis.append([tile_minus1, discarded_tile, tile_plus1])
+        The tile is not removed from hand; callers do that when it was drawn.
+        """
+        self.melds[meld_index] = self.melds[meld_index] + (tile,)
+        # Rare, so rebuild: another 3-tile meld may share the first tile
+        self._gong_candidates = {}
+        for i, meld in enumerate(self.melds):
+            if len(meld) == 3:
+                self._gong_candidates.setdefault(meld[0].index, i)
+    
+    def can_chi(self, discarded_tile: Tile) -> List[List[Tile]]:
+        """
+        Check if can Chi (sequence) from discard.
         
-        if discarded_tile.value <= 7:  # Can be start of sequence
-            # Check for sequence starting with discard (e.g., 4-5-6, discard is 4)
-            tile_plus1 = Tile(discarded_tile.tile_type, discarded_tile.value + 1)
-            tile_plus2 = Tile(discarded_tile.tile_type, discarded_tile.value + 2)
-            if tile_plus1 in self.tiles and tile_plus2 in self.tiles:
-                chis.append([discarded_tile, tile_plus1, tile_plus2])
+        Chi can only be formed from discard (not self-drawn in this variant).
         
-        return chis
+        Returns list of possible chi sequences (empty list if none, so no
+        tiles are built in the common case).
+        """
+        return [[Tile.from_index(start), Tile.from_index(start + 1), Tile.from_index(start + 2)]
+                for start in self.chi_starts(discarded_tile)]
     
     def check_winning_hand(self) -> Tuple[bool, List[List[Tile]]]:
         """
@@ -151,124 +189,58 @@ class Hand:
         NOTE: This check ignores tile count - it only evaluates whether the tile multiset
         can form the required structure, regardless of how many tiles are currently in hand.
         """
-        # Collect all tiles: hand tiles + melds
-        all_tiles = self.tiles.copy()
+        # Counts of all tiles: hand tiles + melds, starting from the hand's
+        # maintained counts. Pairs are tried in order of first appearance;
+        # hand tiles are sorted, so for them that is index order.
+        counts = self.counts.copy()
+        pair_candidates = [idx for idx in range(NUM_TILE_KINDS) if counts[idx]]
         for meld in self.melds:
-            all_tiles.extend(meld)
+            for tile in meld:
+                if counts[tile.index] == 0:
+                    pair_candidates.append(tile.index)
+                counts[tile.index] += 1
+        
+        # Cheap necessary conditions before the search: a pair needs a count
+        # of 2+, and 4 melds + pair need 14 tiles (extra tiles are allowed)
+        pair_candidates = [idx for idx in pair_candidates if counts[idx] >= 2]
+        total = sum(counts)
+        if not pair_candidates or total < 14:
+            return False, []
+        # Exactly 14 tiles (no gongs): decide from the per-suit tables, and
+        # only search for the melds of hands that do win
+        if total == 14 and not is_complete_hand(counts):
+            return False, []
         
         # Try to find winning pattern (ignores tile count)
-        return self._find_winning_pattern(all_tiles)
+        return self._match_pattern(counts, pair_candidates)
     
-    def _find_winning_pattern(self, tiles: List[Tile]) -> Tuple[bool, List[List[Tile]]]:
+    def _match_pattern(self, counts: List[int], pair_candidates: List[int]) -> Tuple[bool, List[List[Tile]]]:
         """
         Find winning pattern: 4 melds + 1 pair
         
         NOTE: This method ignores tile count. It only checks if the tile multiset
         can be decomposed into 4 melds (pong/chi) + 1 pair, regardless of total count.
         If there are extra tiles, we try all possible pairs and see if any combination works.
-        """
-        if len(tiles) == 0:
-            return False, []
-        
-        # If we have exactly 14 tiles, use the standard algorithm
-        if len(tiles) == 14:
-            tile_counts = Counter(tiles)
-            for pair_tile, count in tile_counts.items():
-                if count >= 2:
-                    remaining = tiles.copy()
-                    remaining.remove(pair_tile)
-                    remaining.remove(pair_tile)
-                    melds = self._form_melds(remaining)
-                    if melds is not None and len(melds) == 4:
-                        return True, melds + [[pair_tile, pair_tile]]
-            return False, []
-        
-        # If we have more or fewer tiles, try all possible pairs
-        # and see if we can form 4 melds from the remaining tiles
-        tile_counts = Counter(tiles)
-        
-        # Try each possible pair
-        for pair_tile, count in tile_counts.items():
-            if count >= 2:
-                # Remove pair
-                remaining = tiles.copy()
-                remaining.remove(pair_tile)
-                remaining.remove(pair_tile)
-                
-                # Try to form 4 melds from remaining tiles
-                # The _form_melds method will handle extra tiles by finding exactly 4 melds
-                melds = self._form_melds(remaining)
-                if melds is not None and len(melds) == 4:
-                    return True, melds + [[pair_tile, pair_tile]]
         
-        return False, []
-    
-    def _form_melds(self, tiles: List[Tile]) -> Optional[List[List[Tile]]]:
-        """
-        Try to form melds (triplets or sequences) from tiles.
+        The search runs on a 34-slot count vector (see kernels.find_winning_pattern).
         
-        Returns 4 melds if possible, None otherwise.
-        NOTE: We need exactly 4 melds (12 tiles), but we allow extra tiles to be ignored.
-        The recursive algorithm will naturally handle extra tiles by only using what it needs.
+        Args:
+            counts: Tile counts indexed by Tile.index (not modified)
+            pair_candidates: Tile indices to try as the pair, in order
         """
-        if len(tiles) == 0:
-            return []
-        
-        # We need exactly 4 melds, so we need at least 12 tiles (4 * 3)
-        if len(tiles) < 12:
-            return None
-        
-        # The recursive algorithm will try to form exactly 4 melds
-        # If there are extra tiles, they will be ignored (the algorithm stops when it finds 4 melds)
-        tiles_sorted = sorted(tiles)
-        result = self._form_melds_recursive(tiles_sorted, [])
-        return result if result else None
+        found = find_winning_pattern(counts, pair_candidates)
+        if found is None:
+            return False, []
+        # Tiles are only rebuilt for winning hands
+        pair_idx, meld_codes = found
+        pair_tile = Tile.from_index(pair_idx)
+        return True, [self._decode_meld(code) for code in meld_codes] + [[pair_tile, pair_tile]]
     
-    def _form_melds_recursive(self, tiles: List[Tile], current_melds: List[List[Tile]]) -> Optional[List[List[Tile]]]:
-        """
-        Recursively try to form melds.
-        
-        NOTE: This method will stop as soon as it finds exactly 4 melds,
-        even if there are extra tiles remaining. This allows the algorithm
-        to work with tile counts greater than 12.
-        """
-        # If we already have 4 melds, we're done (even if there are extra tiles)
-        if len(current_melds) == 4:
-            return current_melds
-        
-        if len(tiles) == 0:
-            return current_melds if len(current_melds) == 4 else None
-        
-        if len(tiles) < 3:
-            return None
-        
-        # Try triplet first
-        first_tile = tiles[0]
-        count = sum(1 for t in tiles if t == first_tile)
-        
-        if count >= 3:
-            # Try triplet
-            remaining = tiles.copy()
-            for _ in range(3):
-                remaining.remove(first_tile)
-            result = self._form_melds_recursive(remaining, current_melds + [[first_tile, first_tile, first_tile]])
-            if result:
-                return result
-        
-        # Try sequence (only for wan/tiao/tong)
-        if first_tile.tile_type in [TileType.WAN, TileType.TIAO, TileType.TONG]:
-            if first_tile.value <= 7:  # Can form sequence
-                next1 = Tile(first_tile.tile_type, first_tile.value + 1)
-                next2 = Tile(first_tile.tile_type, first_tile.value + 2)
-                
-                if next1 in tiles and next2 in tiles:
-                    remaining = tiles.copy()
-                    remaining.remove(first_tile)
-                    remaining.remove(next1)
-                    remaining.remove(next2)
-                    result = self._form_melds_recursive(remaining, current_melds + [[first_tile, next1, next2]])
-                    if result:
-                        return result
-        
-        return None
-
+    @staticmethod
+    def _decode_meld(code: int) -> List[Tile]:
+        """Convert a kernel meld code back to a list of tiles"""
+        if code < SEQUENCE_OFFSET:
+            tile = Tile.from_index(code)
+            return [tile, tile, tile]
+        start = code - SEQUENCE_OFFSET
+        return [Tile.from_index(start), Tile.from_index(start + 1), Tile.from_index(start + 2)]
@@ -0,0 +1,341 @@
+"""
+Count-vector kernels for hand evaluation.
+
+A hand is represented as 34 tile counts indexed by Tile.index. The kernels
+only use plain loops and integer indexing so the same source runs as plain
+Python (on lists) or compiled by Numba (on int64 arrays); see accel.py.
+
+Meld codes returned by form_melds:
+- 0-33: triplet of that tile index
+- 34-67: sequence starting at (code - 34)
+
+is_complete_hand decides exactly-14-tile hands from per-suit lookup tables.
+
+meld_features summarizes a list of melds given as rows of tile indices.
+"""
+
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from typing import FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .accel import HAS_NUMBA, njit, get_backend
+
+SEQUENCE_OFFSET = 34
+
+# IS_SEQUENCE_START[i]: a sequence can start at tile index i (suits 1-7).
+# A module-level tuple, so Numba freezes it as a constant.
+IS_SEQUENCE_START = tuple(i < 27 and i % 9 <= 6 for i in range(34))
+
+# Entries kept by the per-process find_winning_pattern cache
+PATTERN_CACHE_SIZE = 1 << 16
+
+
+def _form_melds_py(counts, out, firsts, kinds):
+    """
+    Find 4 melds (triplets/sequences) in counts by backtracking.
+
+    Mirrors the recursive tile-list search: always meld the lowest remaining
+    tile, trying a triplet before a sequence; extra tiles after 4 melds are
+    ignored. counts is modified in place; firsts/kinds are scratch buffers
+    of length 4 (kinds: 0 = untried, 1 = triplet, 2 = sequence).
+    """
+    remaining = 0
+    for c in counts:
+        remaining += c
+    if remaining < 12:
+        return False
+
+    depth = 0
+    i = 0
+    while counts[i] == 0:
+        i += 1
+    firsts[0] = i
+    kinds[0] = 0
+    while True:
+        i = firsts[depth]
+        kind = kinds[depth]
+        # Undo the meld previously placed at this depth
+        if kind == 1:
+            counts[i] += 3
+            remaining += 3
+        elif kind == 2:
+            counts[i] += 1
+            counts[i + 1] += 1
+            counts[i + 2] += 1
+            remaining += 3
+
+        placed = False
+        if kind == 0 and counts[i] >= 3:
+            counts[i] -= 3
+            kinds[depth] = 1
+            out[depth] = i
+            placed = True
+        elif kind <= 1 and IS_SEQUENCE_START[i] and counts[i + 1] > 0 and counts[i + 2] > 0:
+            counts[i] -= 1
+            counts[i + 1] -= 1
+            counts[i + 2] -= 1
+            kinds[depth] = 2
+            out[depth] = i + 34
+            placed = True
+
+        if placed:
+            remaining -= 3
+            depth += 1
+            if depth == 4:
+                return True
+            if remaining < 3:
+                depth -= 1
+                continue
+            j = i
+            while counts[j] == 0:
+                j += 1
+            firsts[depth] = j
+            kinds[depth] = 0
+        else:
+            kinds[depth] = 0
+            depth -= 1
+            if depth < 0:
+                return False
+
+
+# Signature of the jitted kernel: int64 count vector plus three int64 buffers
+FORM_MELDS_SIGNATURE = "b1(i8[:], i8[:], i8[:], i8[:])"
+
+# With an explicit signature Numba compiles eagerly at import time, and
+# cache=True stores the machine code in __pycache__, so later runs (and
+# every pool worker) load it instead of JIT-compiling on the first hand.
+_form_melds_jit = njit(FORM_MELDS_SIGNATURE, cache=True)(_form_melds_py) if HAS_NUMBA else None
+
+
+def _make_find_pattern(form_melds_kernel):
+    """
+    Build the pair loop around a form-melds kernel (Python or jitted).
+
+    The pair loop has to call the jitted search when compiled and the Python
+    one otherwise, so it closes over the kernel it should use.
+    """
+    def _find_pattern(counts, pair_candidates, out, firsts, kinds):
+        """
+        Try each pair candidate in order; return the first tile index that
+        leaves 4 melds (written to out), or -1. counts is restored.
+        """
+        for k in range(len(pair_candidates)):
+            idx = pair_candidates[k]
+            if counts[idx] >= 2:
+                counts[idx] -= 2
+                found = form_melds_kernel(counts, out, firsts, kinds)
+                counts[idx] += 2
+                if found:
+                    return idx
+        return -1
+    return _find_pattern
+
+
+_find_pattern_py = _make_find_pattern(_form_melds_py)
+
+FIND_PATTERN_SIGNATURE = "i8(i8[:], i8[:], i8[:], i8[:], i8[:])"
+
+_find_pattern_jit = (njit(FIND_PATTERN_SIGNATURE, cache=True)(_make_find_pattern(_form_melds_jit))
+                     if HAS_NUMBA else None)
+
+
+def form_melds(counts: Sequence[int]) -> Optional[List[int]]:
+    """
+    Try to form 4 melds from a 34-slot count vector.
+
+    Args:
+        counts: Tile counts indexed by Tile.index (not modified)
+
+    Returns:
+        List of 4 meld codes, or None if no decomposition exists
+    """
+    if get_backend() == "numba":
+        out = np.zeros(4, dtype=np.int64)
+        found = _form_melds_jit(np.array(counts, dtype=np.int64), out,
+                                np.zeros(4, dtype=np.int64), np.zeros(4, dtype=np.int64))
+        return out.tolist() if found else None
+    out = [0, 0, 0, 0]
+    if _form_melds_py(list(counts), out, [0, 0, 0, 0], [0, 0, 0, 0]):
+        return out
+    return None
+
+
+def find_winning_pattern(counts: Sequence[int], pair_candidates: Sequence[int]) -> Optional[Tuple[int, List[int]]]:
+    """
+    Find a pair plus 4 melds in a 34-slot count vector.
+
+    Runs the whole pair loop in one kernel call, so the Numba backend makes
+    a single native call per hand check. Results are memoized on the exact
+    inputs (counts and pair order, packed into bytes): the same hand is
+    typically checked several times in a turn, e.g. by check_win and then
+    again by the fan calculation.
+
+    Args:
+        counts: Tile counts indexed by Tile.index (not modified)
+        pair_candidates: Tile indices to try as the pair, in order
+
+    Returns:
+        (pair tile index, list of 4 meld codes), or None if the hand is not winning
+    """
+    found = _find_winning_pattern_cached(bytes(counts), bytes(pair_candidates))
+    if found is None:
+        return None
+    return found[0], list(found[1])
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def _find_winning_pattern_cached(counts_key: bytes, candidates_key: bytes) -> Optional[Tuple[int, Tuple[int, ...]]]:
+    """Uncached search for find_winning_pattern; the bytes keys unpack to int lists."""
+    if get_backend() == "numba":
+        out = np.zeros(4, dtype=np.int64)
+        pair = _find_pattern_jit(np.frombuffer(counts_key, dtype=np.uint8).astype(np.int64),
+                                 np.frombuffer(candidates_key, dtype=np.uint8).astype(np.int64),
+                                 out, np.zeros(4, dtype=np.int64), np.zeros(4, dtype=np.int64))
+        return (int(pair), tuple(out.tolist())) if pair >= 0 else None
+    out = [0, 0, 0, 0]
+    pair = _find_pattern_py(list(counts_key), list(candidates_key), out, [0, 0, 0, 0], [0, 0, 0, 0])
+    return (pair, tuple(out)) if pair >= 0 else None
+
+
+# (start, stop) of the independent count segments: melds never cross them
+SEGMENTS = ((0, 9), (9, 18), (18, 27), (27, 34))
+
+
+def _segment_table(width: int, with_sequences: bool) -> Tuple[FrozenSet[bytes], FrozenSet[bytes]]:
+    """
+    Enumerate every segment that splits exactly into up to 4 melds.
+
+    Returns (segments of melds only, segments of melds plus one pair),
+    each as the set of count slices packed into bytes.
+    """
+    melds = [(i, i, i) for i in range(width)]
+    if with_sequences:
+        melds += [(i, i + 1, i + 2) for i in range(width - 2)]
+    plain = set()
+    paired = set()
+    for size in range(5):
+        for combo in combinations_with_replacement(melds, size):
+            counts = [0] * width
+            for meld in combo:
+                for i in meld:
+                    counts[i] += 1
+            plain.add(bytes(counts))
+            for i in range(width):
+                counts[i] += 2
+                paired.add(bytes(counts))
+                counts[i] -= 2
+    return frozenset(plain), frozenset(paired)
+
+
+@lru_cache(maxsize=None)
+def _segment_tables() -> Tuple[Tuple[FrozenSet[bytes], FrozenSet[bytes]], ...]:
+    """Lookup tables for SEGMENTS, built on first use (about 50k suit entries)."""
+    suit = _segment_table(9, True)
+    return suit, suit, suit, _segment_table(7, False)
+
+
+def is_complete_hand(counts: Sequence[int]) -> bool:
+    """
+    Whether an exactly-14-tile count vector splits into 4 melds + 1 pair.
+
+    With 14 tiles every tile must be used, and melds never cross a suit,
+    so each segment must be in its melds-only table except one segment,
+    which holds the pair. This agrees with find_winning_pattern for
+    14-tile vectors but skips the search, so it is a cheap reject test.
+
+    Args:
+        counts: Tile counts indexed by Tile.index, summing to 14
+    """
+    pair_segment = None
+    for (start, stop), (plain, paired) in zip(SEGMENTS, _segment_tables()):
+        key = bytes(counts[start:stop])
+        if key not in plain:
+            if pair_segment is not None or key not in paired:
+                return False
+            pair_segment = start
+    return pair_segment is not None
+
+
+# Slots of the meld_features output vector
+FEATURE_TRIPLETS = 0       # Distinct triplet/gong tiles
+FEATURE_SEQUENCES = 1      # Sequences (chi), counted per meld
+FEATURE_MIXED_CHI = 2      # 1 if the same chi appears in all three suits
+FEATURE_LITTLE_DRAGONS = 3  # 1 if two dragon triplets + pair of the third dragon
+NUM_MELD_FEATURES = 4
+
+
+def _meld_features_py(meld_ids, meld_lens, out):
+    """
+    Scan melds once and write the fan-relevant structure into out.
+
+    meld_ids rows hold tile indices (padded with -1 in the array form) and
+    meld_lens the real meld lengths. Pairs (length 2) only matter for
+    little dragons. Set bookkeeping uses int bitmasks so the same source
+    runs under Numba.
+    """
+    seen_triplets = 0   # Bit i set: triplet of tile index i already counted
+    chi_suits = 0       # Bit 3 * low + suit set: chi low..low+2 seen in suit
+    num_triplets = 0
+    num_sequences = 0
+    dragon_triplets = 0
+    dragon_triplet_mask = 0
+    dragon_pair = -1
+    for r in range(len(meld_lens)):
+        row = meld_ids[r]
+        n = meld_lens[r]
+        first = row[0]
+        if n == 2:
+            if first >= 31 and row[1] == first:
+                dragon_pair = first
+        elif n >= 3:
+            if row[1] == first and row[2] == first:
+                if (seen_triplets >> first) & 1 == 0:
+                    seen_triplets |= 1 << first
+                    num_triplets += 1
+                if first >= 31:
+                    dragon_triplets += 1
+                    dragon_triplet_mask |= 1 << (first - 31)
+            elif IS_SEQUENCE_START[first] and row[1] == first + 1 and row[2] == first + 2:
+                num_sequences += 1
+                if n == 3:
+                    chi_suits |= 1 << (3 * (first % 9) + first // 9)
+
+    out[0] = num_triplets
+    out[1] = num_sequences
+    out[2] = 0
+    for low in range(7):
+        if (chi_suits >> (3 * low)) & 7 == 7:
+            out[2] = 1
+    out[3] = 0
+    if dragon_triplets == 2 and dragon_pair >= 0 and (dragon_triplet_mask >> (dragon_pair - 31)) & 1 == 0:
+        out[3] = 1
+
+
+MELD_FEATURES_SIGNATURE = "void(i8[:, :], i8[:], i8[:])"
+
+_meld_features_jit = njit(MELD_FEATURES_SIGNATURE, cache=True)(_meld_features_py) if HAS_NUMBA else None
+
+
+def meld_features(meld_ids: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Summarize melds for fan calculation.
+
+    Args:
+        meld_ids: One row of tile indices per meld (2-4 tiles each)
+
+    Returns:
+        List of NUM_MELD_FEATURES ints, indexed by the FEATURE_* constants
+    """
+    meld_lens = [len(row) for row in meld_ids]
+    if get_backend() == "numba":
+        ids = np.full((len(meld_ids), 4), -1, dtype=np.int64)
+        for r, row in enumerate(meld_ids):
+            ids[r, :len(row)] = row
+        out = np.zeros(NUM_MELD_FEATURES, dtype=np.int64)
+        _meld_features_jit(ids, np.array(meld_lens, dtype=np.int64), out)
+        return out.tolist()
+    out = [0] * NUM_MELD_FEATURES
+    _meld_features_py(meld_ids, meld_lens, out)
+    return out
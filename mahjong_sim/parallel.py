@@ -0,0 +1,83 @@
+"""
+Process-pool helpers for running independent Monte Carlo trials in parallel.
+
+Trials share no state, so each one is dispatched as a separate task and
+seeded explicitly; this keeps results reproducible regardless of how many
+worker processes are used.
+"""
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Shared inputs (e.g. cfg) installed once per worker by init_worker_state
+worker_state: Dict[str, Any] = {}
+
+
+def init_worker_state(state: Dict[str, Any]) -> None:
+    """Pool initializer: store shared task inputs in this process's worker_state."""
+    worker_state.clear()
+    worker_state.update(state)
+
+
+def resolve_num_workers(cfg: Dict[str, Any]) -> int:
+    """
+    Number of worker processes to use for trial loops.
+
+    Reads cfg["num_workers"]; None or 0 means one worker per CPU core.
+    """
+    num_workers = cfg.get("num_workers")
+    if not num_workers:
+        return os.cpu_count() or 1
+    return max(1, int(num_workers))
+
+
+def trial_seeds(cfg: Dict[str, Any], num_trials: int, seeds_per_trial: int = 1) -> np.ndarray:
+    """
+    Derive independent seeds for every trial from cfg["seed"] in one call.
+
+    If no seed is configured, fresh OS entropy is used (non-reproducible runs).
+
+    Returns:
+        uint32 array of shape (num_trials,) or, if seeds_per_trial > 1,
+        (num_trials, seeds_per_trial)
+    """
+    rng = np.random.default_rng(cfg.get("seed"))
+    size = num_trials if seeds_per_trial == 1 else (num_trials, seeds_per_trial)
+    return rng.integers(0, 2**32 - 1, size=size, dtype=np.uint32)
+
+
+def seed_trial(seed: int) -> None:
+    """Seed the global RNGs used by the simulation (tile wall shuffles)."""
+    random.seed(int(seed))
+    np.random.seed(int(seed))
+
+
+def run_parallel(fn: Callable[[Any], Any], tasks: Sequence[Any], num_workers: int,
+                 initializer: Optional[Callable[..., None]] = None,
+                 initargs: Tuple = ()) -> List[Any]:
+    """
+    Map fn over tasks using a process pool, preserving task order.
+
+    Falls back to a plain loop for a single worker or a single task, which
+    avoids process start-up cost for small runs (and keeps tests simple).
+    fn must be defined at module level so it can be pickled.
+
+    Args:
+        initializer: Optional function run once per worker with initargs, used
+            to ship large shared inputs (e.g. cfg) once instead of per task.
+            In the serial fallback it is run once in the current process.
+    """
+    num_workers = min(num_workers, len(tasks))
+    if num_workers <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [fn(task) for task in tasks]
+    chunksize = max(1, len(tasks) // (num_workers * 4))
+    with ProcessPoolExecutor(max_workers=num_workers, initializer=initializer,
+                             initargs=initargs) as executor:
+        return list(executor.map(fn, tasks, chunksize=chunksize))
@@ -25,20 +25,15 @@ class NeutralPolicy:
             "medium_risk_threshold": 0.45,  # Risk level to start accepting fan >= 2 wins
             "bailout_risk_threshold": 0.70  # Risk level to bail out and accept any win (fan >= 1)
         }
+        # Unpacked once: should_hu runs at every win opportunity
+        self._target_fan = self.thresholds.get("target_fan", 3)
+        self._medium_risk = self.thresholds.get("medium_risk_threshold", 0.45)
+        self._bailout_risk = self.thresholds.get("bailout_risk_threshold", 0.70)
 
     def should_hu(self, fan: Union[int, float], risk: float) -> bool:
-        target_fan = self.thresholds.get("target_fan", 3)
-        medium_risk = self.thresholds.get("medium_risk_threshold", 0.45)
-        bailout_risk = self.thresholds.get("bailout_risk_threshold", 0.70)
-        
         # High risk: risk >= 0.70, accept fan >= 1
-        if risk >= bailout_risk:
-            return fan >= 1
-        
         # Medium risk: 0.45 <= risk < 0.70, accept fan >= 2
-        if risk >= medium_risk and risk < bailout_risk:
-            return fan >= 2
-        
         # Low risk: risk < 0.45, pursue target fan (fan >= 3)
-        return fan >= target_fan
+        required = 1 if risk >= self._bailout_risk else (2 if risk >= self._medium_risk else self._target_fan)
+        return fan >= required
 
@@ -1,7 +1,9 @@
 """
 Plotting utilities for Mahjong Monte-Carlo experiments.
 
-All plots are saved as PNG files (dpi=200) in non-interactive mode.
+All plots are saved as PNG files (dpi=200) in non-interactive mode. Layout
+is fitted once with tight_layout(); savefig does not pass bbox_inches='tight',
+which would draw every figure a second time just to crop it.
 """
 
 import os
@@ -9,6 +11,24 @@ import matplotlib
 matplotlib.use('Agg')  # Non-interactive backend
 import matplotlib.pyplot as plt
 import numpy as np
+from scipy.interpolate import CubicSpline
+
+from .fan_calculator import MAX_FAN
+from .parallel import run_parallel
+
+# Drawing defaults set once at import. A 1-pixel simplify threshold drops
+# sub-pixel vertices (the dense fit and smoothed curves) before Agg
+# rasterizes them; chunking keeps very long paths within Agg's limits.
+matplotlib.rcParams.update({
+    'savefig.dpi': 200,
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+})
+
+# zlib level 1: PNG encoding dominates saving these simple plots, and
+# level 1 encodes several times faster than the default 6 for slightly larger files
+PNG_SAVE_OPTIONS = {"compress_level": 1}
 
 
 def ensure_dir(path):
@@ -16,6 +36,43 @@ def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
 
+# Label keywords that pick a strategy's color ('def' also covers 'defensive', 'agg' 'aggressive')
+_COLOR_KEYWORDS = (('def', 'green'), ('agg', 'red'))
+
+
+def _auto_color(label, default):
+    """Color for a series label: green for defensive, red for aggressive, else default."""
+    if label:
+        label = label.lower()
+        for keyword, color in _COLOR_KEYWORDS:
+            if keyword in label:
+                return color
+    return default
+
+
+def _run_plot_job(job):
+    """Worker entry point for save_many: call fn(*args, **kwargs)."""
+    fn, args, kwargs = job
+    return fn(*args, **kwargs)
+
+
+def save_many(jobs, num_workers=None):
+    """
+    Render independent plots in parallel worker processes.
+    
+    Each plot is CPU-bound (Agg rendering and PNG encoding) and shares no
+    state, so a batch scales with the number of processes.
+    
+    Args:
+        jobs: Iterable of (function, args, kwargs) tuples, e.g.
+              (save_bar_plot, (labels, values, title, outfile), {"ylabel": "Wins"});
+              functions must be module-level so they can be pickled
+        num_workers: Number of processes (default: one per CPU core, at most one per job)
+    """
+    jobs = list(jobs)
+    run_parallel(_run_plot_job, jobs, num_workers or os.cpu_count() or 1)
+
+
 def save_line_plot(x, y, title, xlabel, ylabel, outfile, y2=None, label1=None, label2=None, legend=True, color1=None, color2=None):
     """
     Save a line plot.
@@ -36,16 +93,11 @@ def save_line_plot(x, y, title, xlabel, ylabel, outfile, y2=None, label1=None, l
     """
     plt.figure(figsize=(8, 6))
     # Use label1 if provided, otherwise use ylabel if no y2, else default to 'Line 1'
-    first_label = label1 if label1 is not None else (ylabel if not y2 else 'Line 1')
+    first_label = label1 if label1 is not None else (ylabel if y2 is None else 'Line 1')
     
     # Auto-assign colors based on labels if not provided
     if color1 is None:
-        if first_label and ('defensive' in first_label.lower() or 'def' in first_label.lower()):
-            color1 = 'green'
-        elif first_label and ('aggressive' in first_label.lower() or 'agg' in first_label.lower()):
-            color1 = 'red'
-        else:
-            color1 = '#1f77b4'  # Default blue
+        color1 = _auto_color(first_label, '#1f77b4')  # Default blue
     
     plt.plot(x, y, marker='o', linewidth=2, markersize=6, label=first_label, color=color1)
     
@@ -53,12 +105,7 @@ def save_line_plot(x, y, title, xlabel, ylabel, outfile, y2=None, label1=None, l
         second_label = label2 or 'Line 2'
         # Auto-assign color for second line
         if color2 is None:
-            if second_label and ('defensive' in second_label.lower() or 'def' in second_label.lower()):
-                color2 = 'green'
-            elif second_label and ('aggressive' in second_label.lower() or 'agg' in second_label.lower()):
-                color2 = 'red'
-            else:
-                color2 = '#ff7f0e'  # Default orange
+            color2 = _auto_color(second_label, '#ff7f0e')  # Default orange
         plt.plot(x, y2, marker='s', linewidth=2, markersize=6, label=second_label, color=color2)
     
     plt.xlabel(xlabel, fontsize=12)
@@ -70,7 +117,7 @@ def save_line_plot(x, y, title, xlabel, ylabel, outfile, y2=None, label1=None, l
         plt.legend()
     
     plt.tight_layout()
-    plt.savefig(outfile, dpi=200, bbox_inches='tight')
+    plt.savefig(outfile, dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
     plt.close()
 
 
@@ -90,21 +137,62 @@ def save_bar_plot(labels, values, title, outfile, ylabel="Value", color=None):
     bars = plt.bar(labels, values, color=color, alpha=0.7, edgecolor='black', linewidth=1.5)
     
     # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height:.2f}',
-                ha='center', va='bottom', fontsize=10)
+    plt.gca().bar_label(bars, fmt='%.2f', fontsize=10)
     
     plt.xlabel('Category', fontsize=12)
     plt.ylabel(ylabel, fontsize=12)
     plt.title(title, fontsize=14, fontweight='bold')
     plt.grid(True, alpha=0.3, axis='y')
     plt.tight_layout()
-    plt.savefig(outfile, dpi=200, bbox_inches='tight')
+    plt.savefig(outfile, dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
     plt.close()
 
 
+def _finite(values):
+    """Coerce to a float64 array (no copy if it already is one) and drop NaN/inf values."""
+    values = np.asarray(values, dtype=np.float64)
+    return values[np.isfinite(values)]
+
+
+def _finite_pairs(x, y):
+    """Coerce x and y to float64 arrays, truncate to a common length and keep pairs where both are finite."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = min(len(x), len(y))
+    x, y = x[:n], y[:n]
+    valid = np.isfinite(x) & np.isfinite(y)
+    return x[valid], y[valid]
+
+
+def _linear_fit(x, y):
+    """
+    Least-squares line through (x, y) in closed form.
+    
+    Returns:
+        (slope, intercept, r_squared), or None if all x values are identical
+    """
+    dx = x - x.mean()
+    dy = y - y.mean()
+    sxx = dx @ dx
+    if sxx == 0:
+        return None
+    sxy = dx @ dy
+    syy = dy @ dy
+    slope = sxy / sxx
+    r_squared = sxy * sxy / (sxx * syy) if syy > 0 else 0.0
+    return slope, y.mean() - slope * x.mean(), r_squared
+
+
+def _series_range(series_list):
+    """
+    (min, max) over several non-empty arrays without concatenating them.
+    
+    Passed as range= to np.histogram_bin_edges, this gives the same edges
+    as binning the concatenated data.
+    """
+    return min(series.min() for series in series_list), max(series.max() for series in series_list)
+
+
 def save_hist(data=None, title=None, outfile=None, xlabel="Value", ylabel="Frequency", bins=20, density=False, 
               data_dict=None, labels=None, colors=None):
     """
@@ -131,38 +219,32 @@ def save_hist(data=None, title=None, outfile=None, xlabel="Value", ylabel="Frequ
             colors = default_colors
         
         # Collect all data to determine common bin edges for consistent comparison
-        all_data = []
         data_list = []
         labels_list = []
         for label, series_data in data_dict.items():
-            if not isinstance(series_data, np.ndarray):
-                series_data = np.array(series_data)
-            series_data = series_data[np.isfinite(series_data)]
+            series_data = _finite(series_data)
             if len(series_data) > 0:
-                all_data.extend(series_data)
                 data_list.append(series_data)
                 labels_list.append(label)
         
-        if len(all_data) == 0:
+        if len(data_list) == 0:
             print(f"Warning: No valid data for histogram: {title}")
             plt.close()
             return
         
         # Use common bin edges for all histograms to ensure fair comparison
-        all_data = np.array(all_data)
-        _, bin_edges = np.histogram(all_data, bins=bins)
+        bin_edges = np.histogram_bin_edges(np.empty(0), bins=bins, range=_series_range(data_list))
         
-        # Plot each histogram with common bins, using step style for better visibility
-        for i, (label, series_data) in enumerate(zip(labels_list, data_list)):
-            counts, _ = np.histogram(series_data, bins=bin_edges, density=density)
-            # Use step plot for clearer visibility when overlapping
-            plt.step(bin_edges[:-1], counts, where='post', linewidth=2, 
-                    label=label, color=colors[i % len(colors)], alpha=0.8)
-            # Fill under the step for better visual effect
-            plt.fill_between(bin_edges[:-1], counts, step='post', 
-                           alpha=0.3, color=colors[i % len(colors)])
+        series_colors = [colors[i % len(colors)] for i in range(len(data_list))]
+        # Filled steps for the area, then outlined steps on top for visibility when overlapping
+        plt.hist(data_list, bins=bin_edges, density=density, histtype='stepfilled',
+                 alpha=0.3, color=series_colors)
+        plt.hist(data_list, bins=bin_edges, density=density, histtype='step',
+                 linewidth=2, alpha=0.8, color=series_colors, label=labels_list)
         
-        plt.legend()
+        # hist() adds multi-dataset patches last-to-first; restore series order in the legend
+        handles, handle_labels = plt.gca().get_legend_handles_labels()
+        plt.legend(handles[::-1], handle_labels[::-1])
     else:
         # Single histogram
         if data is None:
@@ -170,12 +252,8 @@ def save_hist(data=None, title=None, outfile=None, xlabel="Value", ylabel="Frequ
             plt.close()
             return
         
-        # Convert to numpy array if needed
-        if not isinstance(data, np.ndarray):
-            data = np.array(data)
-        
         # Filter out any NaN or inf values
-        data = data[np.isfinite(data)]
+        data = _finite(data)
         
         if len(data) == 0:
             print(f"Warning: No valid data for histogram: {title}")
@@ -189,7 +267,7 @@ def save_hist(data=None, title=None, outfile=None, xlabel="Value", ylabel="Frequ
     plt.title(title, fontsize=14, fontweight='bold')
     plt.grid(True, alpha=0.3, axis='y')
     plt.tight_layout()
-    plt.savefig(outfile, dpi=200, bbox_inches='tight')
+    plt.savefig(outfile, dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
     plt.close()
 
 
@@ -212,24 +290,8 @@ def save_scatter_plot(x, y, title, xlabel, ylabel, outfile, alpha=0.5, fit_line=
         label1: Optional label for first series
         label2: Optional label for second series
     """
-    from scipy import stats
-    
-    # Convert to numpy arrays if needed
-    if not isinstance(x, np.ndarray):
-        x = np.array(x)
-    if not isinstance(y, np.ndarray):
-        y = np.array(y)
-    
-    # Ensure same length
-    if len(x) != len(y):
-        min_len = min(len(x), len(y))
-        x = x[:min_len]
-        y = y[:min_len]
-    
-    # Filter out any NaN or inf values
-    valid = np.isfinite(x) & np.isfinite(y)
-    x = x[valid]
-    y = y[valid]
+    # Truncate to the same length and filter out any NaN or inf values
+    x, y = _finite_pairs(x, y)
     
     if len(x) == 0:
         print(f"Warning: No valid data for scatter plot: {title}")
@@ -246,39 +308,30 @@ def save_scatter_plot(x, y, title, xlabel, ylabel, outfile, alpha=0.5, fit_line=
     plt.scatter(x, y, alpha=alpha, s=20, label=label1, color=color1)
     
     # Add fit line for first series if requested
-    if fit_line and len(x) > 1:
-        slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
-        line_x = np.linspace(x.min(), x.max(), 100)
+    fit = _linear_fit(x, y) if fit_line and len(x) > 1 else None
+    if fit is not None:
+        slope, intercept, r_squared = fit
+        # A straight line only needs its two endpoints
+        line_x = np.array([x.min(), x.max()])
         line_y = slope * line_x + intercept
         plt.plot(line_x, line_y, color=color1, linestyle='--', linewidth=2, 
-                label=f'Fit (R²={r_value**2:.3f})' if label1 is None else f'{label1} Fit (R²={r_value**2:.3f})')
+                label=f'Fit (R²={r_squared:.3f})' if label1 is None else f'{label1} Fit (R²={r_squared:.3f})')
     
     # Plot second series if provided
     if x2 is not None and y2 is not None:
-        if not isinstance(x2, np.ndarray):
-            x2 = np.array(x2)
-        if not isinstance(y2, np.ndarray):
-            y2 = np.array(y2)
-        
-        if len(x2) != len(y2):
-            min_len = min(len(x2), len(y2))
-            x2 = x2[:min_len]
-            y2 = y2[:min_len]
-        
-        valid2 = np.isfinite(x2) & np.isfinite(y2)
-        x2 = x2[valid2]
-        y2 = y2[valid2]
+        x2, y2 = _finite_pairs(x2, y2)
         
         if len(x2) > 0:
             plt.scatter(x2, y2, alpha=alpha, s=20, label=label2, color=color2)
             
             # Add fit line for second series if requested
-            if fit_line and len(x2) > 1:
-                slope2, intercept2, r_value2, p_value2, std_err2 = stats.linregress(x2, y2)
-                line_x2 = np.linspace(x2.min(), x2.max(), 100)
+            fit2 = _linear_fit(x2, y2) if fit_line and len(x2) > 1 else None
+            if fit2 is not None:
+                slope2, intercept2, r_squared2 = fit2
+                line_x2 = np.array([x2.min(), x2.max()])
                 line_y2 = slope2 * line_x2 + intercept2
                 plt.plot(line_x2, line_y2, color=color2, linestyle='--', linewidth=2,
-                        label=f'{label2} Fit (R²={r_value2**2:.3f})' if label2 else f'Fit 2 (R²={r_value2**2:.3f})')
+                        label=f'{label2} Fit (R²={r_squared2:.3f})' if label2 else f'Fit 2 (R²={r_squared2:.3f})')
     
     plt.xlabel(xlabel, fontsize=12)
     plt.ylabel(ylabel, fontsize=12)
@@ -289,7 +342,7 @@ def save_scatter_plot(x, y, title, xlabel, ylabel, outfile, alpha=0.5, fit_line=
         plt.legend()
     
     plt.tight_layout()
-    plt.savefig(outfile, dpi=200, bbox_inches='tight')
+    plt.savefig(outfile, dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
     plt.close()
 
 
@@ -308,33 +361,27 @@ def save_kde_plot(data_dict, title, outfile, xlabel="Value", ylabel="Density", c
         colors: Optional list of colors
         bins: Number of bins for histogram (default: 50)
     """
-    from scipy.interpolate import interp1d
-    
     plt.figure(figsize=(8, 6))
     
     default_colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b']
     if colors is None:
         colors = default_colors
     
-    # Determine common x range and bin edges
-    all_data = []
-    for series_data in data_dict.values():
-        if not isinstance(series_data, np.ndarray):
-            series_data = np.array(series_data)
-        series_data = series_data[np.isfinite(series_data)]
-        if len(series_data) > 0:
-            all_data.extend(series_data)
+    # Filter each series once, then determine common x range and bin edges
+    series_by_label = {}
+    for label, series_data in data_dict.items():
+        series_by_label[label] = _finite(series_data)
     
-    if len(all_data) == 0:
+    non_empty = [series_data for series_data in series_by_label.values() if len(series_data) > 0]
+    if len(non_empty) == 0:
         print(f"Warning: No valid data for KDE plot: {title}")
         plt.close()
         return
     
-    all_data = np.array(all_data)
-    x_min, x_max = np.min(all_data), np.max(all_data)
+    x_min, x_max = _series_range(non_empty)
     x_range = x_max - x_min
     # Use common bin edges for fair comparison
-    _, bin_edges = np.histogram(all_data, bins=bins)
+    bin_edges = np.histogram_bin_edges(np.empty(0), bins=bins, range=(x_min, x_max))
     bin_centers = (bin_edges[:-1] + bin_edges[1:]) / 2
     bin_width = bin_edges[1] - bin_edges[0]
     
@@ -343,11 +390,7 @@ def save_kde_plot(data_dict, title, outfile, xlabel="Value", ylabel="Density", c
     
     # Plot smoothed percentage distribution for each series
     has_data = False
-    for i, (label, series_data) in enumerate(data_dict.items()):
-        if not isinstance(series_data, np.ndarray):
-            series_data = np.array(series_data)
-        series_data = series_data[np.isfinite(series_data)]
-        
+    for i, (label, series_data) in enumerate(series_by_label.items()):
         if len(series_data) > 0:
             # Calculate histogram counts (not density)
             counts, _ = np.histogram(series_data, bins=bin_edges)
@@ -361,17 +404,20 @@ def save_kde_plot(data_dict, title, outfile, xlabel="Value", ylabel="Density", c
                 try:
                     # Only interpolate where we have data
                     valid_mask = percentages > 0
-                    if np.sum(valid_mask) > 1:
-                        f = interp1d(bin_centers[valid_mask], percentages[valid_mask], 
-                                   kind='cubic', bounds_error=False, fill_value=0)
-                        y_plot = f(x_plot)
+                    num_valid = np.count_nonzero(valid_mask)
+                    if num_valid > 1:
+                        if num_valid < 4:
+                            raise ValueError("cubic interpolation needs at least 4 points")
+                        # Not-a-knot cubic spline (the curve interp1d(kind='cubic') builds),
+                        # zero outside the data range
+                        spline = CubicSpline(bin_centers[valid_mask], percentages[valid_mask],
+                                             extrapolate=False)
+                        y_plot = np.nan_to_num(spline(x_plot))
                         # Ensure non-negative
                         y_plot = np.maximum(y_plot, 0)
                     else:
                         # Fallback to linear if not enough points
-                        f = interp1d(bin_centers, percentages, 
-                                   kind='linear', bounds_error=False, fill_value=0)
-                        y_plot = f(x_plot)
+                        y_plot = np.interp(x_plot, bin_centers, percentages, left=0, right=0)
                         y_plot = np.maximum(y_plot, 0)
                     
                     plt.plot(x_plot, y_plot, linewidth=2, label=label, 
@@ -399,7 +445,7 @@ def save_kde_plot(data_dict, title, outfile, xlabel="Value", ylabel="Density", c
     plt.grid(True, alpha=0.3)
     plt.legend()
     plt.tight_layout()
-    plt.savefig(outfile, dpi=200, bbox_inches='tight')
+    plt.savefig(outfile, dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
     plt.close()
 
 
@@ -431,7 +477,7 @@ def save_multi_bar_plot(labels, data_dict, title, outfile, ylabel="Value"):
     plt.legend()
     plt.grid(True, alpha=0.3, axis='y')
     plt.tight_layout()
-    plt.savefig(outfile, dpi=200, bbox_inches='tight')
+    plt.savefig(outfile, dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
     plt.close()
 
 
@@ -448,30 +494,60 @@ def save_stacked_fan_distribution(def_fans, agg_fans, title, outfile, xlabel="Fa
         ylabel: Y-axis label
         neu_fans: Optional list/array of fan values for neutral players (for total wins calculation)
     """
-    # Filter out zeros and convert to arrays
-    def_fans = np.array([f for f in def_fans if f > 0])
-    agg_fans = np.array([f for f in agg_fans if f > 0])
-    neu_fans = np.array([f for f in neu_fans if f > 0]) if neu_fans is not None else np.array([])
+    save_stacked_fan_histogram(
+        _fan_counts(def_fans),
+        _fan_counts(agg_fans),
+        title,
+        outfile,
+        xlabel=xlabel,
+        ylabel=ylabel,
+        neu_counts=_fan_counts(neu_fans) if neu_fans is not None else None
+    )
+
+
+def _fan_counts(fans):
+    """Bin a list/array of non-negative integer fan values (index = fan value)."""
+    fans = np.asarray(fans, dtype=np.int64)
+    return np.bincount(fans, minlength=MAX_FAN + 1)
+
+
+def save_stacked_fan_histogram(def_counts, agg_counts, title, outfile, xlabel="Fan Value", ylabel="Frequency", neu_counts=None):
+    """
+    Save a stacked bar chart for fan distribution from pre-binned counts.
     
-    if len(def_fans) == 0 and len(agg_fans) == 0:
+    Args:
+        def_counts: Win counts per fan value for defensive strategy (index = fan; index 0 is ignored)
+        agg_counts: Win counts per fan value for aggressive strategy (index = fan; index 0 is ignored)
+        title: Plot title
+        outfile: Output file path
+        xlabel: X-axis label
+        ylabel: Y-axis label
+        neu_counts: Optional win counts per fan value for neutral players (for total wins calculation)
+    """
+    # Pad to a common length and drop fan 0 (non-winning rounds)
+    size = max(len(def_counts), len(agg_counts))
+    def_counts = np.pad(np.asarray(def_counts, dtype=np.int64), (0, size - len(def_counts)))
+    agg_counts = np.pad(np.asarray(agg_counts, dtype=np.int64), (0, size - len(agg_counts)))
+    def_counts[:1] = 0
+    agg_counts[:1] = 0
+    
+    if def_counts.sum() == 0 and agg_counts.sum() == 0:
         print(f"Warning: No valid fan data for stacked distribution: {title}")
         return
     
-    # Get all unique fan values (from strategy takers only)
-    all_fans = np.concatenate([def_fans, agg_fans]) if len(def_fans) > 0 and len(agg_fans) > 0 else (def_fans if len(def_fans) > 0 else agg_fans)
-    unique_fans = np.unique(all_fans)
-    unique_fans = np.sort(unique_fans)
+    # Fan values observed for strategy takers
+    unique_fans = np.flatnonzero(def_counts + agg_counts)
     
     # Count occurrences for each fan value
-    def_counts = [np.sum(def_fans == f) for f in unique_fans]
-    agg_counts = [np.sum(agg_fans == f) for f in unique_fans]
+    def_counts, agg_counts = def_counts[unique_fans].tolist(), agg_counts[unique_fans].tolist()
     total_counts = [d + a for d, a in zip(def_counts, agg_counts)]
     
     # Calculate strategy taker's total wins (DEF + AGG only)
-    strategy_takers_total = len(def_fans) + len(agg_fans)
+    strategy_takers_total = sum(total_counts)
     
     # Calculate total wins (DEF + AGG + NEU, excluding draws)
-    total_wins = strategy_takers_total + len(neu_fans)
+    neu_wins = int(np.sum(neu_counts[1:])) if neu_counts is not None else 0
+    total_wins = strategy_takers_total + neu_wins
     
     # Create figure
     fig, ax = plt.subplots(figsize=(14, 6))
@@ -499,18 +575,16 @@ def save_stacked_fan_distribution(def_fans, agg_fans, title, outfile, xlabel="Fa
     strategy_bar = ax.bar(x_pos[-1], strategy_takers_total, label="Strategy Taker's Wins", 
                           color=strategy_color, alpha=0.7, edgecolor='black', linewidth=1)
     
-    # Add value labels on bars
-    for i, (d, a, t) in enumerate(zip(def_counts, agg_counts, total_counts)):
-        if d > 0:
-            ax.text(x_pos[i], d/2, str(d), ha='center', va='center', fontsize=9, fontweight='bold', color='white')
-        if a > 0:
-            ax.text(x_pos[i], d + a/2, str(a), ha='center', va='center', fontsize=9, fontweight='bold', color='white')
-        if t > 0:
-            ax.text(x_pos[i], d + a, str(t), ha='center', va='bottom', fontsize=9, fontweight='bold')
+    # Add value labels on bars (segment counts centered, totals on top; zeros unlabeled)
+    ax.bar_label(def_bars, labels=[str(d) if d > 0 else '' for d in def_counts],
+                 label_type='center', fontsize=9, fontweight='bold', color='white')
+    ax.bar_label(agg_bars, labels=[str(a) if a > 0 else '' for a in agg_counts],
+                 label_type='center', fontsize=9, fontweight='bold', color='white')
+    ax.bar_label(agg_bars, labels=[str(t) if t > 0 else '' for t in total_counts],
+                 fontsize=9, fontweight='bold')
     
     # Label for strategy taker's wins bar
-    ax.text(x_pos[-1], strategy_takers_total/2, str(strategy_takers_total), ha='center', va='center', 
-            fontsize=10, fontweight='bold', color='white')
+    ax.bar_label(strategy_bar, label_type='center', fontsize=10, fontweight='bold', color='white')
     
     # Set x-axis labels
     x_labels = [str(int(f)) for f in unique_fans] + ["Strategy\nTaker's\nWins"]
@@ -530,6 +604,6 @@ def save_stacked_fan_distribution(def_fans, agg_fans, title, outfile, xlabel="Fa
     ax.grid(True, alpha=0.3, axis='y')
     
     plt.tight_layout()
-    plt.savefig(outfile, dpi=200, bbox_inches='tight')
+    plt.savefig(outfile, dpi=200, pil_kwargs=PNG_SAVE_OPTIONS)
     plt.close()
 
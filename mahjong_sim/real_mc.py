@@ -29,7 +29,11 @@ from .scoring import (
 from .strategies import defensive_strategy, aggressive_strategy, BaseStrategy, TableState, TempoDefender, ValueChaser
 from .tiles import Tile, TileType, TileWall
 from .hand import Hand
-from .fan_calculator import FanCalculator
+from .fan_calculator import FanCalculator, MAX_FAN
+from .accel import set_backend
+from .config import SimConfig
+from .parallel import (resolve_num_workers, trial_seeds, seed_trial, run_parallel,
+                       init_worker_state, worker_state)
 
 
 
@@ -42,6 +46,51 @@ from .fan_calculator import FanCalculator
 #       FanCalculator is now in fan_calculator.py
 
 
+def _hu_strategy_impl(player: "Player", fan: int, fan_min: int, fan_threshold: int, risk: float) -> bool:
+    return player.strategy_impl.should_hu(fan, risk, player.hand, fan_min, fan_threshold)
+
+
+def _hu_policy(player: "Player", fan: int, fan_min: int, fan_threshold: int, risk: float) -> bool:
+    return player.strategy_fn.should_hu(fan, risk)
+
+
+def _hu_def(player: "Player", fan: int, fan_min: int, fan_threshold: int, risk: float) -> bool:
+    return fan >= fan_min
+
+
+def _hu_agg(player: "Player", fan: int, fan_min: int, fan_threshold: int, risk: float) -> bool:
+    return fan >= fan_threshold
+
+
+def _hu_neu(player: "Player", fan: int, fan_min: int, fan_threshold: int, risk: float) -> bool:
+    # Neutral policy fallback (should rarely be used if NeutralPolicy object is provided)
+    strategy_cfg = player.cfg.get("strategy_thresholds", {})
+    neutral_thresholds = strategy_cfg.get("neutral_policy", {})
+    target_fan = neutral_thresholds.get("target_fan", 3)
+    medium_risk = neutral_thresholds.get("medium_risk_threshold", 0.45)
+    bailout_risk = neutral_thresholds.get("bailout_risk_threshold", 0.70)
+    # High risk: risk >= 0.70, accept fan >= 1
+    if risk >= bailout_risk:
+        return fan >= 1
+    # Medium risk: 0.45 <= risk < 0.70, accept fan >= 2
+    if risk >= medium_risk and risk < bailout_risk:
+        return fan >= 2
+    # Low risk: risk < 0.45, pursue target fan (fan >= 3)
+    return fan >= target_fan
+
+
+def _hu_callable(player: "Player", fan: int, fan_min: int, fan_threshold: int, risk: float) -> bool:
+    return player.strategy_fn(fan)
+
+
+def _hu_any(player: "Player", fan: int, fan_min: int, fan_threshold: int, risk: float) -> bool:
+    return fan >= 1
+
+
+# Built-in Hu rules for players without a strategy object, by strategy_type
+_HU_RULES = {"DEF": _hu_def, "AGG": _hu_agg, "NEU": _hu_neu}
+
+
 class Player:
     """Mahjong player"""
     def __init__(self, player_id: int, strategy_type: str, strategy_fn=None, cfg=None):
@@ -56,35 +105,22 @@ class Player:
         self.wins = 0
         self.deal_ins = 0
         self.missed_hus = 0
+        # The Hu rule depends only on the strategy, so resolve it once here
+        # instead of re-dispatching on strategy_type for every win opportunity
+        if self.strategy_impl:
+            self._hu_rule = _hu_strategy_impl
+        elif hasattr(strategy_fn, "should_hu"):
+            self._hu_rule = _hu_policy
+        elif strategy_type in _HU_RULES:
+            self._hu_rule = _HU_RULES[strategy_type]
+        elif callable(strategy_fn):
+            self._hu_rule = _hu_callable
+        else:
+            self._hu_rule = _hu_any
     
     def should_hu(self, fan: int, fan_min: int = 1, fan_threshold: int = 3, risk: float = 0.0) -> bool:
         """Strategy decision: should declare Hu?"""
-        if self.strategy_impl:
-            return self.strategy_impl.should_hu(fan, risk, self.hand, fan_min, fan_threshold)
-        if hasattr(self.strategy_fn, "should_hu"):
-            return self.strategy_fn.should_hu(fan, risk)
-        if self.strategy_type == "DEF":
-            return fan >= fan_min
-        elif self.strategy_type == "AGG":
-            return fan >= fan_threshold
-        elif self.strategy_type == "NEU":
-            # Neutral policy fallback (should rarely be used if NeutralPolicy object is provided)
-            strategy_cfg = self.cfg.get("strategy_thresholds", {})
-            neutral_thresholds = strategy_cfg.get("neutral_policy", {})
-            target_fan = neutral_thresholds.get("target_fan", 3)
-            medium_risk = neutral_thresholds.get("medium_risk_threshold", 0.45)
-            bailout_risk = neutral_thresholds.get("bailout_risk_threshold", 0.70)
-            # High risk: risk >= 0.70, accept fan >= 1
-            if risk >= bailout_risk:
-                return fan >= 1
-            # Medium risk: 0.45 <= risk < 0.70, accept fan >= 2
-            if risk >= medium_risk and risk < bailout_risk:
-                return fan >= 2
-            # Low risk: risk < 0.45, pursue target fan (fan >= 3)
-            return fan >= target_fan
-        elif callable(self.strategy_fn):
-            return self.strategy_fn(fan)
-        return fan >= 1
+        return self._hu_rule(self, fan, fan_min, fan_threshold, risk)
 
     def should_claim(self, action: str, context: dict) -> bool:
         """Decide whether to claim discard for gong/pong/chi."""
@@ -114,7 +150,7 @@ class Player:
     def can_win_on_tile(self, tile: Tile, is_self_draw: bool = False) -> Tuple[bool, int]:
         """Check if can win with this tile, return (can_win, fan)"""
         # Check if tile is already in hand
-        tile_already_in_hand = tile in self.hand.tiles
+        tile_already_in_hand = self.hand.counts[tile.index] > 0
         
         # Add tile temporarily (if not already in hand)
         if not tile_already_in_hand:
@@ -147,9 +183,11 @@ class RealMCSimulation:
         self.current_player = 0
         self.discard_pile: List[Tile] = []
         self.round_results: List[Dict] = []
-        # Get risk calculation parameter from config
-        risk_cfg = cfg.get("risk_calculation", {})
-        self.risk_max_denominator = risk_cfg.get("max_denominator", 100)
+        # Read scalar parameters once instead of per-turn cfg lookups
+        self.sim_cfg = SimConfig.from_dict(cfg)
+        self.risk_max_denominator = self.sim_cfg.risk_max_denominator
+        # Select hand-evaluation kernel backend (Numba if available by default)
+        set_backend(self.sim_cfg.accel)
     
     def _calculate_risk(self) -> float:
         """Calculate risk based on discard pile size and wall remaining"""
@@ -223,8 +261,8 @@ class RealMCSimulation:
             
             if can_win:
                 # Strategy decision
-                fan_min = self.cfg.get("fan_min", 1)
-                fan_threshold = self.cfg.get("t_fan_threshold", 3)
+                fan_min = self.sim_cfg.fan_min
+                fan_threshold = self.sim_cfg.t_fan_threshold
                 # Estimate risk (simplified: based on discard pile size)
                 risk = self._calculate_risk()
                 table_state = TableState(
@@ -248,12 +286,10 @@ class RealMCSimulation:
             gong_meld_idx = player.hand.can_gong(drawn_tile)
             if gong_meld_idx is not None and 0 <= gong_meld_idx < len(player.hand.melds):
                 # Upgrade existing Pong meld to Gong
-                old_pong = player.hand.melds[gong_meld_idx]
                 # Remove the 4th tile from hand (drawn_tile)
                 if player.hand.remove_tile(drawn_tile):
                     # Replace Pong with Gong (4 tiles)
-                    gong_meld = old_pong.copy() + [drawn_tile]
-                    player.hand.melds[gong_meld_idx] = gong_meld
+                    player.hand.upgrade_to_gong(gong_meld_idx, drawn_tile)
                     # Gong is a fixed meld (no special marking needed)
                     
                     # Player restarts turn: continuously check for Gong and win after drawing replacement tiles
@@ -269,8 +305,8 @@ class RealMCSimulation:
                         can_win_after_gong, fan_after_gong = player.can_win_on_tile(
                             replacement, is_self_draw=True)
                         if can_win_after_gong:
-                            fan_min = self.cfg.get("fan_min", 1)
-                            fan_threshold = self.cfg.get("t_fan_threshold", 3)
+                            fan_min = self.sim_cfg.fan_min
+                            fan_threshold = self.sim_cfg.t_fan_threshold
                             risk = self._calculate_risk()
                             if player.should_hu(fan_after_gong, fan_min, fan_threshold, risk):
                                 return self._process_win(player, fan_after_gong, is_self_draw=True)
@@ -279,10 +315,8 @@ class RealMCSimulation:
                         gong_meld_idx = player.hand.can_gong(replacement)
                         if gong_meld_idx is not None and 0 <= gong_meld_idx < len(player.hand.melds):
                             # Upgrade another Pong meld to Gong
-                            old_pong = player.hand.melds[gong_meld_idx]
                             if player.hand.remove_tile(replacement):
-                                gong_meld = old_pong.copy() + [replacement]
-                                player.hand.melds[gong_meld_idx] = gong_meld
+                                player.hand.upgrade_to_gong(gong_meld_idx, replacement)
                                 # Continue loop to draw another replacement tile
                                 continue
                             else:
@@ -331,8 +365,8 @@ class RealMCSimulation:
                             # Note: can_win_on_tile temporarily adds the tile, so it works even if
                             # drawn_tile was already removed (part of pong) or still in hand
                             if can_win_after_pong:
-                                fan_min = self.cfg.get("fan_min", 1)
-                                fan_threshold = self.cfg.get("t_fan_threshold", 3)
+                                fan_min = self.sim_cfg.fan_min
+                                fan_threshold = self.sim_cfg.t_fan_threshold
                                 risk = self._calculate_risk()
                                 if player.should_hu(fan_after_pong, fan_min, fan_threshold, risk):
                                     return self._process_win(player, fan_after_pong, is_self_draw=True)
@@ -399,8 +433,8 @@ class RealMCSimulation:
                     can_win_other, fan_other = other_player.can_win_on_tile(
                         discard, is_self_draw=False)
                     if can_win_other:
-                        fan_min = self.cfg.get("fan_min", 1)
-                        fan_threshold = self.cfg.get("t_fan_threshold", 3)
+                        fan_min = self.sim_cfg.fan_min
+                        fan_threshold = self.sim_cfg.t_fan_threshold
                         # Estimate risk for opponent
                         risk = self._calculate_risk()
                         # Build opponent discard info for this check
@@ -459,10 +493,8 @@ class RealMCSimulation:
                             if not other_player.should_claim("gong", {"risk": risk_local, "table_state": table_state_local, "fan": 0}):
                                 continue
                             # Upgrade existing Pong meld to Gong
-                            old_pong = other_player.hand.melds[gong_meld_idx]
                             # Replace Pong with Gong (4 tiles: 3 from meld + discard)
-                            gong_meld = old_pong.copy() + [discard]
-                            other_player.hand.melds[gong_meld_idx] = gong_meld
+                            other_player.hand.upgrade_to_gong(gong_meld_idx, discard)
                             # Remove discard from discard_pile (it's being claimed for Gong)
                             if discard in self.discard_pile:
                                 self.discard_pile.remove(discard)
@@ -482,8 +514,8 @@ class RealMCSimulation:
                                 can_win_after_gong, fan_after_gong = other_player.can_win_on_tile(
                                     replacement, is_self_draw=True)
                                 if can_win_after_gong:
-                                    fan_min = self.cfg.get("fan_min", 1)
-                                    fan_threshold = self.cfg.get("t_fan_threshold", 3)
+                                    fan_min = self.sim_cfg.fan_min
+                                    fan_threshold = self.sim_cfg.t_fan_threshold
                                     risk = self._calculate_risk()
                                     if other_player.should_hu(fan_after_gong, fan_min, fan_threshold, risk):
                                         return self._process_win(other_player, fan_after_gong, 
@@ -493,10 +525,8 @@ class RealMCSimulation:
                                 gong_meld_idx = other_player.hand.can_gong(replacement)
                                 if gong_meld_idx is not None and 0 <= gong_meld_idx < len(other_player.hand.melds):
                                     # Upgrade another Pong meld to Gong
-                                    old_pong = other_player.hand.melds[gong_meld_idx]
                                     if other_player.hand.remove_tile(replacement):
-                                        gong_meld = old_pong.copy() + [replacement]
-                                        other_player.hand.melds[gong_meld_idx] = gong_meld
+                                        other_player.hand.upgrade_to_gong(gong_meld_idx, replacement)
                                         # Continue loop to draw another replacement tile
                                         continue
                                     else:
@@ -569,64 +599,62 @@ class RealMCSimulation:
                                     # Failed to remove all tiles, skip this pong and try next player
                                     continue
                         # Check for Chi (sequence)
-                        elif other_player.hand.can_chi(discard):
+                        elif chis := other_player.hand.can_chi(discard):
                             # Player does Chi from discard
-                            chis = other_player.hand.can_chi(discard)
-                            if chis:
-                                risk_local = self._calculate_risk()
-                                # Build opponent discard info
-                                opponent_discards_by_suit_local = {}
-                                for j, p in enumerate(self.players):
-                                    if j != i:
-                                        player_discards = self.opponent_discards_by_player[j]
-                                        for discarded_tile in player_discards:
-                                            suit = discarded_tile.tile_type
-                                            if suit not in opponent_discards_by_suit_local:
-                                                opponent_discards_by_suit_local[suit] = []
-                                            opponent_discards_by_suit_local[suit].append(discarded_tile)
-                                table_state_local = TableState(
-                                    discard_pile=self.discard_pile,
-                                    wall_remaining=self.wall.remaining(),
-                                    turn=turn,
-                                    risk=risk_local,
-                                    opponent_discards_by_suit=opponent_discards_by_suit_local,
-                                    total_tiles_discarded=len(self.discard_pile)
-                                )
-                                if not other_player.should_claim("chi", {"risk": risk_local, "table_state": table_state_local, "fan": 0, "meld_options": chis}):
-                                    pass
-                                else:
-                                    chi_meld = chis[0]
-                                    # Remove 2 tiles from hand (discard is the 3rd)
-                                    removed_count = 0
-                                    tiles_to_remove = [t for t in chi_meld if t != discard]
-                                    removed_tiles = []  # Track which tiles were successfully removed
-                                    for tile in tiles_to_remove:
-                                        if other_player.hand.remove_tile(tile):
-                                            removed_count += 1
-                                            removed_tiles.append(tile)
-                                        else:
-                                            # If remove fails, restore removed tiles and skip this chi
-                                            for restored_tile in removed_tiles:
-                                                other_player.hand.add_tile(restored_tile)
-                                            break
+                            risk_local = self._calculate_risk()
+                            # Build opponent discard info
+                            opponent_discards_by_suit_local = {}
+                            for j, p in enumerate(self.players):
+                                if j != i:
+                                    player_discards = self.opponent_discards_by_player[j]
+                                    for discarded_tile in player_discards:
+                                        suit = discarded_tile.tile_type
+                                        if suit not in opponent_discards_by_suit_local:
+                                            opponent_discards_by_suit_local[suit] = []
+                                        opponent_discards_by_suit_local[suit].append(discarded_tile)
+                            table_state_local = TableState(
+                                discard_pile=self.discard_pile,
+                                wall_remaining=self.wall.remaining(),
+                                turn=turn,
+                                risk=risk_local,
+                                opponent_discards_by_suit=opponent_discards_by_suit_local,
+                                total_tiles_discarded=len(self.discard_pile)
+                            )
+                            if not other_player.should_claim("chi", {"risk": risk_local, "table_state": table_state_local, "fan": 0, "meld_options": chis}):
+                                pass
+                            else:
+                                chi_meld = chis[0]
+                                # Remove 2 tiles from hand (discard is the 3rd)
+                                removed_count = 0
+                                tiles_to_remove = [t for t in chi_meld if t != discard]
+                                removed_tiles = []  # Track which tiles were successfully removed
+                                for tile in tiles_to_remove:
+                                    if other_player.hand.remove_tile(tile):
+                                        removed_count += 1
+                                        removed_tiles.append(tile)
+                                    else:
+                                        # If remove fails, restore removed tiles and skip this chi
+                                        for restored_tile in removed_tiles:
+                                            other_player.hand.add_tile(restored_tile)
+                                        break
                                     
-                                    # Only add meld if all tiles were successfully removed
-                                    if removed_count == len(tiles_to_remove):
-                                        # Add exposed Chi (sequence) from discard
-                                        other_player.hand.add_meld(chi_meld, remove_from_hand=False, 
-                                                                  is_concealed=False)
-                                        # Remove discard from discard_pile (it's being claimed for Chi)
-                                        if discard in self.discard_pile:
-                                            self.discard_pile.remove(discard)
+                                # Only add meld if all tiles were successfully removed
+                                if removed_count == len(tiles_to_remove):
+                                    # Add exposed Chi (sequence) from discard
+                                    other_player.hand.add_meld(chi_meld, remove_from_hand=False, 
+                                                              is_concealed=False)
+                                    # Remove discard from discard_pile (it's being claimed for Chi)
+                                    if discard in self.discard_pile:
+                                        self.discard_pile.remove(discard)
                                         
-                                        # Player who did Chi continues
-                                        # action_taken prevents moving to next player, so this player will discard in next turn iteration
-                                        self.current_player = i
-                                        action_taken = True
-                                        break  # Only one player can Chi
-                                    else:
-                                        # Failed to remove all tiles, skip this chi and try next player
-                                        continue
+                                    # Player who did Chi continues
+                                    # action_taken prevents moving to next player, so this player will discard in next turn iteration
+                                    self.current_player = i
+                                    action_taken = True
+                                    break  # Only one player can Chi
+                                else:
+                                    # Failed to remove all tiles, skip this chi and try next player
+                                    continue
                 
                 # If no action taken, move to next player normally
                 if not action_taken:
@@ -645,9 +673,9 @@ class RealMCSimulation:
     def _process_win(self, winner: Player, fan: int, is_self_draw: bool, 
                     deal_in_player: Optional[Player] = None) -> Dict:
         """Process winning result"""
-        score = compute_score(fan, self.cfg.get("base_points", 1))
+        score = compute_score(fan, self.sim_cfg.base_points)
         
-        penalty_multiplier = self.cfg.get("penalty_deal_in", 1)
+        penalty_multiplier = self.sim_cfg.penalty_deal_in
         
         if is_self_draw:
             # Self-draw: winner gets from all 3 opponents
@@ -823,6 +851,10 @@ def simulate_table_round(players, cfg, dealer_index):
     return results, round_meta
 
 
+# Column order of the per_player_metrics array returned by _run_table
+PER_PLAYER_METRICS = ("profit", "win_rate", "deal_in_rate", "mean_fan")
+
+
 def _run_table(players, cfg, rounds_per_trial):
     """Run table simulation with multiple rounds"""
     dealer_index = 0
@@ -830,7 +862,8 @@ def _run_table(players, cfg, rounds_per_trial):
     player_count = len(players)
 
     all_profits = [[] for _ in range(player_count)]
-    all_fans = [[] for _ in range(player_count)]
+    # Fan per (player, round), 0 = no win; fans are capped at MAX_FAN so int16 fits
+    all_fans = np.zeros((player_count, rounds_per_trial), dtype=np.int16)
     all_wins = [[] for _ in range(player_count)]
     all_deal_in_as_winner = [[] for _ in range(player_count)]
     all_deal_in_as_loser = [[] for _ in range(player_count)]
@@ -854,12 +887,12 @@ def _run_table(players, cfg, rounds_per_trial):
         "fans": []
     }
 
-    for _ in range(rounds_per_trial):
+    for round_index in range(rounds_per_trial):
         round_results, round_meta = simulate_table_round(players, cfg, dealer_index)
 
         for i, result in enumerate(round_results):
             all_profits[i].append(result["profit"])
-            all_fans[i].append(result["fan"])
+            all_fans[i, round_index] = result["fan"]
             all_wins[i].append(result["won"])
             all_deal_in_as_winner[i].append(result["deal_in_as_winner"])
             all_deal_in_as_loser[i].append(result["deal_in_as_loser"])
@@ -878,7 +911,6 @@ def _run_table(players, cfg, rounds_per_trial):
 
     def_stats = {
         "profits": [],
-        "fans": [],
         "wins": [],
         "deal_in_as_winner": [],
         "deal_in_as_loser": [],
@@ -887,7 +919,6 @@ def _run_table(players, cfg, rounds_per_trial):
 
     agg_stats = {
         "profits": [],
-        "fans": [],
         "wins": [],
         "deal_in_as_winner": [],
         "deal_in_as_loser": [],
@@ -895,11 +926,13 @@ def _run_table(players, cfg, rounds_per_trial):
     }
 
     per_player_stats = []
+    def_fans = []
+    agg_fans = []
 
     for i, player in enumerate(players):
         profit_sum = np.sum(all_profits[i])
         wins = all_wins[i]
-        fans = [f for f in all_fans[i] if f > 0]
+        fans = all_fans[i][all_fans[i] > 0]
 
         stats = {
             "profit": profit_sum,
@@ -908,7 +941,9 @@ def _run_table(players, cfg, rounds_per_trial):
             "deal_in_rate": np.mean(all_deal_in_as_winner[i]),
             "deal_in_loss_rate": np.mean(all_deal_in_as_loser[i]),
             "missed_win_rate": np.mean(all_missed_hu[i]),
-            "fan_distribution": all_fans[i]
+            "fan_distribution": all_fans[i],
+            # Rounds binned by fan value (index = fan, 0 = no win)
+            "fan_histogram": np.bincount(all_fans[i], minlength=MAX_FAN + 1)
         }
 
         per_player_stats.append({
@@ -919,25 +954,35 @@ def _run_table(players, cfg, rounds_per_trial):
 
         if player.get("strategy_type") == "DEF":
             def_stats["profits"].append(stats["profit"])
-            def_stats["fans"].extend(fans)
+            def_fans.append(fans)
             def_stats["wins"].append(stats["win_rate"])
             def_stats["deal_in_as_winner"].append(stats["deal_in_rate"])
             def_stats["deal_in_as_loser"].append(stats["deal_in_loss_rate"])
             def_stats["missed_hu"].append(stats["missed_win_rate"])
         elif player.get("strategy_type") == "AGG":
             agg_stats["profits"].append(stats["profit"])
-            agg_stats["fans"].extend(fans)
+            agg_fans.append(fans)
             agg_stats["wins"].append(stats["win_rate"])
             agg_stats["deal_in_as_winner"].append(stats["deal_in_rate"])
             agg_stats["deal_in_as_loser"].append(stats["deal_in_loss_rate"])
             agg_stats["missed_hu"].append(stats["missed_win_rate"])
 
+    def_stats["fans"] = np.concatenate(def_fans) if def_fans else np.zeros(0, dtype=np.int16)
+    agg_stats["fans"] = np.concatenate(agg_fans) if agg_fans else np.zeros(0, dtype=np.int16)
+
+    # Same per-player stats as a (players, len(PER_PLAYER_METRICS)) array
+    per_player_metrics = np.array(
+        [[stats[metric] for metric in PER_PLAYER_METRICS] for stats in per_player_stats],
+        dtype=np.float64
+    )
+
     return {
         "defensive": def_stats,
         "aggressive": agg_stats,
         "dealer": dealer_round_stats,
         "non_dealer": non_dealer_round_stats,
-        "per_player": per_player_stats
+        "per_player": per_player_stats,
+        "per_player_metrics": per_player_metrics
     }
 
 
@@ -1000,6 +1045,37 @@ def simulate_custom_table(players, cfg, rounds_per_trial=None):
     return result
 
 
+def _fused_means(*columns):
+    """
+    Means of several equal-length metric lists in a single reduction.
+    Returns zeros if the lists are empty (no players of that type).
+    """
+    stacked = np.array(columns, dtype=np.float64)
+    if stacked.shape[1] == 0:
+        return np.zeros(len(columns))
+    return stacked.mean(axis=1)
+
+
+def _histogram_mean_fan(fan_histogram):
+    """Mean fan of winning rounds from a fan histogram (index = fan, 0 = no win)."""
+    wins = fan_histogram[1:].sum()
+    if wins == 0:
+        return 0.0
+    return float(np.dot(np.arange(1, len(fan_histogram)), fan_histogram[1:]) / wins)
+
+
+def _run_composition_trial(args):
+    """
+    Run one simulate_table trial (executed in a worker process).
+
+    Returns only the per-group stats used by run_composition_experiments.
+    """
+    composition, seed = args
+    seed_trial(seed)
+    trial_result = simulate_table(composition, worker_state["cfg"])
+    return {group: trial_result[group] for group in ("defensive", "aggressive", "dealer", "non_dealer")}
+
+
 def run_composition_experiments(cfg, num_trials=None):
     """
     Run experiments for all table compositions (θ = 0 to 4).
@@ -1021,7 +1097,18 @@ def run_composition_experiments(cfg, num_trials=None):
     
     for composition in compositions:
         print(f"Running composition θ={composition} ({composition} DEF, {4-composition} AGG)...")
-        
+    
+    # All (composition, trial) tasks are independent: run them in one process
+    # pool (cfg["num_workers"]), each seeded from cfg["seed"]
+    seeds = trial_seeds(cfg, num_trials)
+    tasks = [(composition, seed) for composition in compositions for seed in seeds]
+    task_results = run_parallel(_run_composition_trial, tasks, resolve_num_workers(cfg),
+                                initializer=init_worker_state, initargs=({"cfg": cfg},))
+    trials_by_composition = {composition: [] for composition in compositions}
+    for (composition, _), trial_result in zip(tasks, task_results):
+        trials_by_composition[composition].append(trial_result)
+    
+    for composition in compositions:
         all_def_profits = []
         all_agg_profits = []
         all_def_win_rates = []
@@ -1030,37 +1117,36 @@ def run_composition_experiments(cfg, num_trials=None):
         all_agg_deal_in_rates = []
         all_def_missed_hu_rates = []
         all_agg_missed_hu_rates = []
-        all_def_fans = []
-        all_agg_fans = []
+        def_fan_histogram = np.zeros(MAX_FAN + 1, dtype=np.int64)
+        agg_fan_histogram = np.zeros(MAX_FAN + 1, dtype=np.int64)
         all_dealer_profits = []
         all_dealer_wins = []
         all_dealer_deal_in_rates = []
         all_dealer_deal_in_loss_rates = []
         all_dealer_missed_hu = []
-        all_dealer_fans = []
+        dealer_fan_histogram = np.zeros(MAX_FAN + 1, dtype=np.int64)
         all_non_dealer_profits = []
         all_non_dealer_wins = []
         all_non_dealer_deal_in_rates = []
         all_non_dealer_deal_in_loss_rates = []
         all_non_dealer_missed_hu = []
-        all_non_dealer_fans = []
+        non_dealer_fan_histogram = np.zeros(MAX_FAN + 1, dtype=np.int64)
         
-        for _ in range(num_trials):
-            trial_result = simulate_table(composition, cfg)
+        for trial_result in trials_by_composition[composition]:
             
             if len(trial_result["defensive"]["profits"]) > 0:
                 all_def_profits.extend(trial_result["defensive"]["profits"])
                 all_def_win_rates.extend(trial_result["defensive"]["wins"])
                 all_def_deal_in_rates.extend(trial_result["defensive"]["deal_in_as_winner"])
                 all_def_missed_hu_rates.extend(trial_result["defensive"]["missed_hu"])
-                all_def_fans.extend(trial_result["defensive"]["fans"])
+                def_fan_histogram += np.bincount(trial_result["defensive"]["fans"], minlength=MAX_FAN + 1)
             
             if len(trial_result["aggressive"]["profits"]) > 0:
                 all_agg_profits.extend(trial_result["aggressive"]["profits"])
                 all_agg_win_rates.extend(trial_result["aggressive"]["wins"])
                 all_agg_deal_in_rates.extend(trial_result["aggressive"]["deal_in_as_winner"])
                 all_agg_missed_hu_rates.extend(trial_result["aggressive"]["missed_hu"])
-                all_agg_fans.extend(trial_result["aggressive"]["fans"])
+                agg_fan_histogram += np.bincount(trial_result["aggressive"]["fans"], minlength=MAX_FAN + 1)
             
             dealer_stats = trial_result["dealer"]
             non_dealer_stats = trial_result["non_dealer"]
@@ -1070,53 +1156,63 @@ def run_composition_experiments(cfg, num_trials=None):
             all_dealer_deal_in_rates.extend(dealer_stats["deal_in_as_winner"])
             all_dealer_deal_in_loss_rates.extend(dealer_stats["deal_in_as_loser"])
             all_dealer_missed_hu.extend(dealer_stats["missed_hu"])
-            all_dealer_fans.extend(dealer_stats["fans"])
+            dealer_fan_histogram += np.bincount(dealer_stats["fans"], minlength=MAX_FAN + 1)
             
             all_non_dealer_profits.extend(non_dealer_stats["profits"])
             all_non_dealer_wins.extend(non_dealer_stats["wins"])
             all_non_dealer_deal_in_rates.extend(non_dealer_stats["deal_in_as_winner"])
             all_non_dealer_deal_in_loss_rates.extend(non_dealer_stats["deal_in_as_loser"])
             all_non_dealer_missed_hu.extend(non_dealer_stats["missed_hu"])
-            all_non_dealer_fans.extend(non_dealer_stats["fans"])
+            non_dealer_fan_histogram += np.bincount(non_dealer_stats["fans"], minlength=MAX_FAN + 1)
+        
+        # One fused reduction per group instead of a separate np.mean per metric
+        def_means = _fused_means(all_def_profits, all_def_win_rates,
+                                 all_def_deal_in_rates, all_def_missed_hu_rates)
+        agg_means = _fused_means(all_agg_profits, all_agg_win_rates,
+                                 all_agg_deal_in_rates, all_agg_missed_hu_rates)
+        dealer_means = _fused_means(all_dealer_profits, all_dealer_wins, all_dealer_deal_in_rates,
+                                    all_dealer_deal_in_loss_rates, all_dealer_missed_hu)
+        non_dealer_means = _fused_means(all_non_dealer_profits, all_non_dealer_wins, all_non_dealer_deal_in_rates,
+                                        all_non_dealer_deal_in_loss_rates, all_non_dealer_missed_hu)
         
         results[composition] = {
             "defensive": {
-                "mean_profit": np.mean(all_def_profits) if len(all_def_profits) > 0 else 0.0,
+                "mean_profit": def_means[0],
                 "std_profit": np.std(all_def_profits) if len(all_def_profits) > 0 else 0.0,
-                "win_rate": np.mean(all_def_win_rates) if len(all_def_win_rates) > 0 else 0.0,
-                "deal_in_rate": np.mean(all_def_deal_in_rates) if len(all_def_deal_in_rates) > 0 else 0.0,
-                "missed_hu_rate": np.mean(all_def_missed_hu_rates) if len(all_def_missed_hu_rates) > 0 else 0.0,
-                "mean_fan": np.mean(all_def_fans) if len(all_def_fans) > 0 else 0.0,
-                "fan_distribution": all_def_fans
+                "win_rate": def_means[1],
+                "deal_in_rate": def_means[2],
+                "missed_hu_rate": def_means[3],
+                "mean_fan": _histogram_mean_fan(def_fan_histogram),
+                "fan_histogram": def_fan_histogram
             },
             "aggressive": {
-                "mean_profit": np.mean(all_agg_profits) if len(all_agg_profits) > 0 else 0.0,
+                "mean_profit": agg_means[0],
                 "std_profit": np.std(all_agg_profits) if len(all_agg_profits) > 0 else 0.0,
-                "win_rate": np.mean(all_agg_win_rates) if len(all_agg_win_rates) > 0 else 0.0,
-                "deal_in_rate": np.mean(all_agg_deal_in_rates) if len(all_agg_deal_in_rates) > 0 else 0.0,
-                "missed_hu_rate": np.mean(all_agg_missed_hu_rates) if len(all_agg_missed_hu_rates) > 0 else 0.0,
-                "mean_fan": np.mean(all_agg_fans) if len(all_agg_fans) > 0 else 0.0,
-                "fan_distribution": all_agg_fans
+                "win_rate": agg_means[1],
+                "deal_in_rate": agg_means[2],
+                "missed_hu_rate": agg_means[3],
+                "mean_fan": _histogram_mean_fan(agg_fan_histogram),
+                "fan_histogram": agg_fan_histogram
             },
             "dealer": {
-                "mean_profit": np.mean(all_dealer_profits) if len(all_dealer_profits) > 0 else 0.0,
+                "mean_profit": dealer_means[0],
                 "std_profit": np.std(all_dealer_profits) if len(all_dealer_profits) > 0 else 0.0,
-                "win_rate": np.mean(all_dealer_wins) if len(all_dealer_wins) > 0 else 0.0,
-                "deal_in_rate": np.mean(all_dealer_deal_in_rates) if len(all_dealer_deal_in_rates) > 0 else 0.0,
-                "deal_in_loss_rate": np.mean(all_dealer_deal_in_loss_rates) if len(all_dealer_deal_in_loss_rates) > 0 else 0.0,
-                "missed_hu_rate": np.mean(all_dealer_missed_hu) if len(all_dealer_missed_hu) > 0 else 0.0,
-                "mean_fan": np.mean([f for f in all_dealer_fans if f > 0]) if len(all_dealer_fans) > 0 else 0.0,
-                "fan_distribution": all_dealer_fans
+                "win_rate": dealer_means[1],
+                "deal_in_rate": dealer_means[2],
+                "deal_in_loss_rate": dealer_means[3],
+                "missed_hu_rate": dealer_means[4],
+                "mean_fan": _histogram_mean_fan(dealer_fan_histogram),
+                "fan_histogram": dealer_fan_histogram
             },
             "non_dealer": {
-                "mean_profit": np.mean(all_non_dealer_profits) if len(all_non_dealer_profits) > 0 else 0.0,
+                "mean_profit": non_dealer_means[0],
                 "std_profit": np.std(all_non_dealer_profits) if len(all_non_dealer_profits) > 0 else 0.0,
-                "win_rate": np.mean(all_non_dealer_wins) if len(all_non_dealer_wins) > 0 else 0.0,
-                "deal_in_rate": np.mean(all_non_dealer_deal_in_rates) if len(all_non_dealer_deal_in_rates) > 0 else 0.0,
-                "deal_in_loss_rate": np.mean(all_non_dealer_deal_in_loss_rates) if len(all_non_dealer_deal_in_loss_rates) > 0 else 0.0,
-                "missed_hu_rate": np.mean(all_non_dealer_missed_hu) if len(all_non_dealer_missed_hu) > 0 else 0.0,
-                "mean_fan": np.mean([f for f in all_non_dealer_fans if f > 0]) if len(all_non_dealer_fans) > 0 else 0.0,
-                "fan_distribution": all_non_dealer_fans
+                "win_rate": non_dealer_means[1],
+                "deal_in_rate": non_dealer_means[2],
+                "deal_in_loss_rate": non_dealer_means[3],
+                "missed_hu_rate": non_dealer_means[4],
+                "mean_fan": _histogram_mean_fan(non_dealer_fan_histogram),
+                "fan_histogram": non_dealer_fan_histogram
             }
         }
     
@@ -1282,7 +1378,7 @@ def run_multiple_trials(strategy_fn: Union[Callable[[Union[int, float]], bool],
         all_deal_in_rates.append(result["deal_in_rate"])
         all_deal_in_loss_rates.append(result["deal_in_loss_rate"])
         all_missed_win_rates.append(result["missed_win_rate"])
-        all_fan_distributions.extend(result["fan_distribution"])
+        all_fan_distributions.append(result["fan_distribution"])
     
     return {
         "profits": np.array(all_profits),
@@ -1291,6 +1387,6 @@ def run_multiple_trials(strategy_fn: Union[Callable[[Union[int, float]], bool],
         "deal_in_rates": np.array(all_deal_in_rates),
         "deal_in_loss_rates": np.array(all_deal_in_loss_rates),
         "missed_win_rates": np.array(all_missed_win_rates),
-        "fan_distribution": np.array(all_fan_distributions),
+        "fan_distribution": np.concatenate(all_fan_distributions) if all_fan_distributions else np.zeros(0, dtype=np.int16),
         "num_trials": num_trials
     }
@@ -0,0 +1,56 @@
+"""
+On-disk cache for simulation results, keyed by a hash of their inputs.
+
+Results depend only on the config, the strategy class and the simulator
+source, so re-running an experiment with unchanged inputs (e.g. while
+working on plots) can load them instead of re-simulating.
+"""
+
+import glob
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def source_mtime(*extra_paths: str) -> float:
+    """Latest modification time of the mahjong_sim sources and any extra files."""
+    paths = glob.glob(os.path.join(PACKAGE_DIR, "*.py")) + list(extra_paths)
+    return max(os.path.getmtime(path) for path in paths)
+
+
+def results_cache_key(cfg: Dict[str, Any], strategy_class: type, *extra_paths: str) -> str:
+    """
+    Hash (cfg, strategy class, source mtime) into a cache key with blake2b.
+
+    Args:
+        cfg: Configuration dictionary
+        strategy_class: Class of the tested strategy
+        extra_paths: Additional source files the results depend on (e.g. the experiment script)
+    """
+    payload = json.dumps({
+        "cfg": cfg,
+        "strategy": f"{strategy_class.__module__}.{strategy_class.__qualname__}",
+        "source_mtime": source_mtime(*extra_paths),
+    }, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_results(cache_dir: str, key: str) -> Optional[Dict[str, Any]]:
+    """Load cached results for key, or None if there is no cache entry."""
+    path = os.path.join(cache_dir, f"{key}.npz")
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        # 0-d arrays were scalars when saved
+        return {name: data[name][()] if data[name].ndim == 0 else data[name] for name in data.files}
+
+
+def save_results(cache_dir: str, key: str, results: Dict[str, Any]) -> None:
+    """Save a dict of arrays/scalars under key."""
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez_compressed(os.path.join(cache_dir, f"{key}.npz"), **results)
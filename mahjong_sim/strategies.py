@@ -2,6 +2,8 @@ from typing import Union
 from dataclasses import dataclass
 from collections import Counter
 
+from .tiles import HONOR_TYPES, TYPE_SIZES
+
 # -----------------------------------------------------------------------------
 # Legacy threshold-based strategies (kept for compatibility with existing tests)
 # -----------------------------------------------------------------------------
@@ -86,37 +88,37 @@ def _suit_majority(hand_tiles):
     return max(counts.items(), key=lambda kv: kv[1])[0]
 
 
-def _meld_potential_score(tile, hand_tiles, weights=None):
+def _meld_potential_score(tile, counts, weights=None):
     """
     Minimal heuristic: pairs > near-sequences > honors.
     Lower score => worse tile to keep.
     
     Args:
         tile: Tile to evaluate
-        hand_tiles: List of tiles in hand
+        counts: The hand's 34-slot tile count vector (Hand.counts)
         weights: Optional dict with scoring weights (pair_potential, sequence_potential, honor_value)
     """
     if weights is None:
         weights = {"pair_potential": 3, "sequence_potential": 0.5, "honor_value": 0.8}
     
-    same = sum(1 for t in hand_tiles if t == tile)
+    idx = tile.index
     score = 0
-    if same >= 2:
+    if counts[idx] >= 2:
         score += weights.get("pair_potential", 3)  # pair/pong potential
-    # two-sided wait potential
+    # two-sided wait potential: copies of same-type tiles within 2 values
+    sequence_potential = weights.get("sequence_potential", 0.5)
+    size = TYPE_SIZES[tile.tile_type]
     for delta in (-2, -1, 1, 2):
-        for t in hand_tiles:
-            if t.tile_type == tile.tile_type and t.value == tile.value + delta:
-                score += weights.get("sequence_potential", 0.5)
-    if tile.tile_type.name in ["FENG", "JIAN"]:
+        if 1 <= tile.value + delta <= size:
+            score += sequence_potential * counts[idx + delta]
+    if tile.tile_type in HONOR_TYPES:
         score += weights.get("honor_value", 0.8)  # small value for honors
     return score
 
 
-def _safety_score(tile, discard_pile):
+def _safety_score(tile, discard_counts):
     """Safer if already visible in discards (fewer remaining copies)."""
-    seen = sum(1 for t in discard_pile if t == tile)
-    return seen  # higher is safer
+    return discard_counts[tile]  # higher is safer
 
 
 def _hand_completion_score(hand, weights=None):
@@ -149,15 +151,11 @@ def _hand_completion_score(hand, weights=None):
     completed_melds = sum(1 for m in melds if len(m) >= 3)
     
     # Analyze hand tiles for pairs and tatsu
-    tile_counts = Counter(tiles)
-    pairs = 0
     tatsu = 0
     isolated = 0
     
-    # Count pairs (exactly 2 tiles, not triplets)
-    for tile, count in tile_counts.items():
-        if count == 2:
-            pairs += 1
+    # Count pairs (exactly 2 tiles, not triplets), from the hand's count vector
+    pairs = hand.counts.count(2)
     
     # Count tatsu (2-tile sequences that can become chi)
     # A tatsu is two consecutive tiles of the same suit
@@ -177,7 +175,7 @@ def _hand_completion_score(hand, weights=None):
     
     # Count isolated tiles (tiles with no nearby tiles)
     for tile in tiles:
-        if tile.tile_type.name in ["FENG", "JIAN"]:
+        if tile.tile_type in HONOR_TYPES:
             continue  # Honors are evaluated separately
         is_isolated = True
         for other_tile in tiles:
@@ -267,7 +265,7 @@ def _evaluate_post_discard_hand(hand, tile_to_discard, weights=None):
     isolated_after = 0
     
     for tile in hand.tiles:
-        if tile.tile_type.name in ["FENG", "JIAN"]:
+        if tile.tile_type in HONOR_TYPES:
             continue
         is_isolated = True
         for other_tile in hand.tiles:
@@ -280,7 +278,7 @@ def _evaluate_post_discard_hand(hand, tile_to_discard, weights=None):
             isolated_before += 1
     
     for tile in temp_tiles:
-        if tile.tile_type.name in ["FENG", "JIAN"]:
+        if tile.tile_type in HONOR_TYPES:
             continue
         is_isolated = True
         for other_tile in temp_tiles:
@@ -295,14 +293,16 @@ def _evaluate_post_discard_hand(hand, tile_to_discard, weights=None):
     isolated_reduction = isolated_before - isolated_after
     
     # Evaluate structure clarity (pairs and tatsu in remaining tiles)
-    tile_counts = Counter(temp_tiles)
-    pairs_after = sum(1 for count in tile_counts.values() if count == 2)  # Only count pairs, not triplets
+    counts_after = hand.counts.copy()
+    if counts_after[tile_to_discard.index]:
+        counts_after[tile_to_discard.index] -= 1
+    pairs_after = counts_after.count(2)  # Only count pairs, not triplets
     
     tiles_by_suit = {}
     for tile in temp_tiles:
         if tile.tile_type not in tiles_by_suit:
             tiles_by_suit[tile.tile_type] = []
-        if tile.tile_type.name not in ["FENG", "JIAN"]:
+        if tile.tile_type not in HONOR_TYPES:
             tiles_by_suit[tile.tile_type].append(tile.value)
     
     tatsu_after = 0
@@ -401,6 +401,10 @@ class TempoDefender(BaseStrategy):
             "chi_risk_threshold": 0.35,
             "risk_fan_adjustment": 0.5
         }
+        # Unpacked once: should_hu runs at every win opportunity. Medium and
+        # high risk both accept fan_min, so only the lower threshold matters.
+        self._accept_risk = min(self.thresholds.get("medium_risk_threshold", 0.35),
+                                self.thresholds.get("high_risk_threshold", 0.60))
         self.weights = weights or {
             "pair_potential": 3,
             "sequence_potential": 0.5,
@@ -417,19 +421,11 @@ class TempoDefender(BaseStrategy):
         }
 
     def should_hu(self, fan: int, risk: float, hand, fan_min: int, fan_threshold: int) -> bool:
-        medium_risk_threshold = self.thresholds.get("medium_risk_threshold", 0.35)
-        high_risk_threshold = self.thresholds.get("high_risk_threshold", 0.60)
-        
         # High risk: risk >= 0.60, accept fan >= 1
-        if risk >= high_risk_threshold:
-            return fan >= fan_min
-        
         # Medium risk: 0.35 <= risk < 0.60, accept fan >= 1
-        if risk >= medium_risk_threshold and risk < high_risk_threshold:
-            return fan >= fan_min
-        
         # Low risk: risk < 0.35, pursue fan >= 2
-        return fan >= 2
+        required = fan_min if risk >= self._accept_risk else 2
+        return fan >= required
 
     def decide_claim(self, action: str, context: dict) -> bool:
         risk = context.get("risk", 0.0)
@@ -475,13 +471,16 @@ class TempoDefender(BaseStrategy):
             table_state.opponent_discards_by_suit
         )
         
+        # Copies of each tile already discarded, for the per-tile safety scores
+        discard_counts = Counter(discard_pile)
+        
         scored = []
         for t in tiles:
             # Base meld potential
-            potential = _meld_potential_score(t, tiles, dynamic_weights)
+            potential = _meld_potential_score(t, hand.counts, dynamic_weights)
             
             # Safety score (adjusted by dynamic weights)
-            safety = _safety_score(t, discard_pile)
+            safety = _safety_score(t, discard_counts)
             safety_weighted = safety * dynamic_weights.get("safety_weight", 0.3)
             
             # Suit availability bonus (if suit is frequently discarded by opponents)
@@ -533,6 +532,9 @@ class ValueChaser(BaseStrategy):
             "chi_risk_threshold": 0.7,
             "chi_wall_threshold": 25
         }
+        # Unpacked once: should_hu runs at every win opportunity
+        self._medium_risk = self.thresholds.get("medium_risk_threshold", 0.55)
+        self._bailout_risk = self.thresholds.get("bailout_risk_threshold", 0.80)
         self.weights = weights or {
             "pair_potential": 3,
             "sequence_potential": 0.5,
@@ -549,20 +551,13 @@ class ValueChaser(BaseStrategy):
         }
 
     def should_hu(self, fan: int, risk: float, hand, fan_min: int, fan_threshold: int) -> bool:
-        threshold = max(self.target_threshold, fan_threshold)
-        medium_risk_threshold = self.thresholds.get("medium_risk_threshold", 0.55)
-        bailout_risk_threshold = self.thresholds.get("bailout_risk_threshold", 0.80)
-        
         # High risk: risk >= 0.80, accept fan >= 1
-        if risk >= bailout_risk_threshold:
-            return fan >= 1
-        
         # Medium risk: 0.55 <= risk < 0.80, accept fan >= 3
-        if risk >= medium_risk_threshold and risk < bailout_risk_threshold:
-            return fan >= 3
-        
         # Low risk: risk < 0.55, pursue threshold (fan >= 5)
-        return fan >= threshold
+        required = (1 if risk >= self._bailout_risk else
+                    3 if risk >= self._medium_risk else
+                    max(self.target_threshold, fan_threshold))
+        return fan >= required
 
     def decide_claim(self, action: str, context: dict) -> bool:
         risk = context.get("risk", 0.0)
@@ -613,18 +608,21 @@ class ValueChaser(BaseStrategy):
             table_state.opponent_discards_by_suit
         )
         
+        # Copies of each tile already discarded, for the per-tile safety scores
+        discard_counts = Counter(discard_pile)
+        
         scored = []
         for t in tiles:
             # Strong suit penalty for non-dominant suits (ValueChaser signature)
             suit_penalty = 0
-            if dominant_suit and t.tile_type != dominant_suit and t.tile_type.name not in ["FENG", "JIAN"]:
+            if dominant_suit is not None and t.tile_type != dominant_suit and t.tile_type not in HONOR_TYPES:
                 suit_penalty = dynamic_weights.get("suit_penalty", 2)
             
             # Base meld potential
-            potential = _meld_potential_score(t, tiles, dynamic_weights)
+            potential = _meld_potential_score(t, hand.counts, dynamic_weights)
             
             # Safety score (moderate weight for ValueChaser - balanced risk tolerance)
-            safety = _safety_score(t, discard_pile)
+            safety = _safety_score(t, discard_counts)
             safety_weighted = safety * dynamic_weights.get("safety_weight", 0.3) * 0.8  # Increased from 0.5 to 0.8 for better balance
             
             # Suit availability consideration
@@ -2,86 +2,119 @@
 Tile-related classes for Mahjong game.
 """
 
+from dataclasses import dataclass, field
 from typing import List, Optional
-from enum import Enum
+from enum import IntEnum
 import random
 
 
-class TileType(Enum):
-    """Mahjong tile types"""
-    WAN = "wan"      # 1-9 wan
-    TIAO = "tiao"    # 1-9 tiao
-    TONG = "tong"    # 1-9 tong
-    FENG = "feng"    # East, South, West, North
-    JIAN = "jian"    # Zhong, Fa, Bai
+class TileType(IntEnum):
+    """
+    Mahjong tile types.
 
+    An IntEnum so type comparisons and hashing are plain int operations;
+    the values also give the sort order of tile types.
+    """
+    WAN = 0      # 1-9 wan
+    TIAO = 1     # 1-9 tiao
+    TONG = 2     # 1-9 tong
+    FENG = 3     # East, South, West, North
+    JIAN = 4     # Zhong, Fa, Bai
 
+
+# Offset of each tile type in the 34-slot tile index (wan 0-8, tiao 9-17,
+# tong 18-26, feng 27-30, jian 31-33), used by count-vector kernels
+TYPE_OFFSETS = {TileType.WAN: 0, TileType.TIAO: 9, TileType.TONG: 18,
+                TileType.FENG: 27, TileType.JIAN: 31}
+NUM_TILE_KINDS = 34
+
+# Number of values of each tile type (its kinds occupy TYPE_OFFSETS[t] .. + size - 1)
+TYPE_SIZES = {TileType.WAN: 9, TileType.TIAO: 9, TileType.TONG: 9,
+              TileType.FENG: 4, TileType.JIAN: 3}
+
+# Constant tile-type groups for membership tests
+SUIT_TYPES = frozenset({TileType.WAN, TileType.TIAO, TileType.TONG})
+HONOR_TYPES = frozenset({TileType.FENG, TileType.JIAN})
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Tile:
-    """Single mahjong tile"""
-    def __init__(self, tile_type: TileType, value: int):
-        self.tile_type = tile_type
-        self.value = value  # 1-9 for wan/tiao/tong, 1-4 for feng, 1-3 for jian
+    """
+    Single mahjong tile.
+
+    Immutable and slotted: tiles are shared between the wall, hands, melds
+    and discard piles, and are only ever compared or hashed.
+    """
+    tile_type: TileType
+    value: int  # 1-9 for wan/tiao/tong, 1-4 for feng, 1-3 for jian
+    index: int = field(init=False, repr=False)  # 0-33
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "index", TYPE_OFFSETS[self.tile_type] + self.value - 1)
+    
+    @staticmethod
+    def from_index(index: int) -> "Tile":
+        """Get the tile with a 0-33 index (a shared instance, since tiles are immutable)"""
+        return _TILES_BY_INDEX[index]
     
-    def __eq__(self, other):
+    # Equality, hashing and order all go through the precomputed index
+    def __eq__(self, other: object) -> bool:
         if not isinstance(other, Tile):
             return False
-        return self.tile_type == other.tile_type and self.value == other.value
+        return self.index == other.index
     
-    def __hash__(self):
-        return hash((self.tile_type, self.value))
+    def __hash__(self) -> int:
+        return self.index
     
-    def __repr__(self):
-        return f"Tile({self.tile_type.value}, {self.value})"
+    def __repr__(self) -> str:
+        return f"Tile({self.tile_type.name.lower()}, {self.value})"
     
-    def __lt__(self, other):
-        """For sorting"""
-        type_order = {TileType.WAN: 0, TileType.TIAO: 1, TileType.TONG: 2, 
-                     TileType.FENG: 3, TileType.JIAN: 4}
-        if self.tile_type != other.tile_type:
-            return type_order.get(self.tile_type, 5) < type_order.get(other.tile_type, 5)
-        return self.value < other.value
+    def __lt__(self, other: "Tile") -> bool:
+        """For sorting (index order: by type, then value)"""
+        return self.index < other.index
     
-    def is_same_suit(self, other):
-        """Check if same suit (for sequences)"""
-        return (self.tile_type == other.tile_type and 
-                self.tile_type in [TileType.WAN, TileType.TIAO, TileType.TONG])
+    def is_same_suit(self, other: "Tile") -> bool:
+        """Check if same suit (for sequences): suited indices 0-26 share index // 9"""
+        return self.index < 27 and other.index < 27 and self.index // 9 == other.index // 9
     
-    def is_next(self, other):
+    def is_next(self, other: "Tile") -> bool:
         """Check if other is next in sequence"""
-        return (self.is_same_suit(other) and 
-                self.value + 1 == other.value)
+        return other.index - self.index == 1 and self.is_same_suit(other)
+
+
+def _build_tile(index: int) -> Tile:
+    """Create the tile with a 0-33 index"""
+    if index < 27:
+        return Tile((TileType.WAN, TileType.TIAO, TileType.TONG)[index // 9], index % 9 + 1)
+    if index < 31:
+        return Tile(TileType.FENG, index - 26)
+    return Tile(TileType.JIAN, index - 30)
+
+
+# One shared instance per tile kind, and the unshuffled 136-tile deck
+# (4 copies of each kind in index order: wan, tiao, tong, feng, jian)
+_TILES_BY_INDEX = tuple(_build_tile(index) for index in range(NUM_TILE_KINDS))
+_FULL_DECK = tuple(tile for tile in _TILES_BY_INDEX for _ in range(4))
 
 
 class TileWall:
     """Tile wall - 136 mahjong tiles"""
-    def __init__(self):
+    def __init__(self) -> None:
         self.tiles = self._create_full_deck()
         self.shuffle()
         self.index = 0
     
     def _create_full_deck(self) -> List[Tile]:
-        """Create full 136-tile deck"""
-        tiles = []
-        
-        # Wan, Tiao, Tong: 36 each (4 copies of 1-9)
-        for tile_type in [TileType.WAN, TileType.TIAO, TileType.TONG]:
-            for value in range(1, 10):
-                for _ in range(4):
-                    tiles.append(Tile(tile_type, value))
-        
-        # Feng: 28 tiles (4 copies of East=1, South=2, West=3, North=4)
-        for value in range(1, 5):
-            for _ in range(4):
-                tiles.append(Tile(TileType.FENG, value))
-        
-        # Jian: 12 tiles (4 copies of Zhong=1, Fa=2, Bai=3)
-        for value in range(1, 4):
-            for _ in range(4):
-                tiles.append(Tile(TileType.JIAN, value))
+        """
+        Create full 136-tile deck.
         
-        return tiles
+        Wan, Tiao, Tong: 36 each (4 copies of 1-9); Feng: 16 (4 copies of
+        East=1, South=2, West=3, North=4); Jian: 12 (4 copies of Zhong=1,
+        Fa=2, Bai=3). Tiles are immutable, so the deck reuses shared instances.
+        """
+        return list(_FULL_DECK)
     
-    def shuffle(self):
+    def shuffle(self) -> None:
         """Shuffle tiles"""
         random.shuffle(self.tiles)
         self.index = 0
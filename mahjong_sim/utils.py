@@ -25,17 +25,26 @@ def compute_statistics(data: np.ndarray) -> Dict[str, Union[float, int]]:
     }
 
 
-def compare_strategies(results_def: Dict[str, np.ndarray], results_agg: Dict[str, np.ndarray]) -> Dict[str, Any]:
+def compare_strategies(results_def: Union[np.ndarray, Dict[str, np.ndarray]],
+                       results_agg: Union[np.ndarray, Dict[str, np.ndarray]]) -> Dict[str, Any]:
     """
-    Compare defensive and aggressive strategies using two-sample t-test.
+    Compare defensive and aggressive strategies using Welch's two-sample t-test
+    (unequal variances).
+    
+    Args:
+        results_def: Per-trial profits of the defensive strategy, or a results dict with "profits"
+        results_agg: Per-trial profits of the aggressive strategy, or a results dict with "profits"
     
     Returns:
         Dictionary with comparison statistics
     """
+    profits_def = np.asarray(results_def["profits"] if isinstance(results_def, dict) else results_def)
+    profits_agg = np.asarray(results_agg["profits"] if isinstance(results_agg, dict) else results_agg)
+    
     # Profit comparison
-    profit_stat = stats.ttest_ind(results_def["profits"], results_agg["profits"])
-    profit_def_stats = compute_statistics(results_def["profits"])
-    profit_agg_stats = compute_statistics(results_agg["profits"])
+    profit_stat = stats.ttest_ind(profits_def, profits_agg, equal_var=False)
+    profit_def_stats = compute_statistics(profits_def)
+    profit_agg_stats = compute_statistics(profits_agg)
     
     return {
         "profit": {
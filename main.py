@@ -2,16 +2,16 @@ import sys
 import os
 import argparse
 import contextlib
-import yaml
+from mahjong_sim.config import load_config
 from mahjong_sim.real_mc import run_multiple_trials
 from mahjong_sim.strategies import TempoDefender, ValueChaser
 from mahjong_sim.utils import compare_strategies, compute_statistics
 
 
-def run_experiment_1(cfg):
-    """Run Experiment 1: Strategy Comparison"""
+def run_experiment_1(cfg, force=False):
+    """Run Experiment 1: Strategy Comparison (force=True ignores cached results)"""
     import experiments.run_experiment_1 as exp1
-    exp1.main()
+    exp1.main(force=force)
 
 
 def run_experiment_2(cfg):
@@ -79,7 +79,7 @@ class TeeStream:
             stream.flush()
 
 
-def run_with_logging(filename, func, cfg):
+def run_with_logging(filename, func, cfg, **kwargs):
     # Create output directory if it doesn't exist
     project_root = os.path.dirname(os.path.abspath(__file__))
     output_dir = os.path.join(project_root, "output")
@@ -89,7 +89,7 @@ def run_with_logging(filename, func, cfg):
     with open(output_path, "w", encoding="utf-8") as outfile:
         tee = TeeStream(sys.stdout, outfile)
         with contextlib.redirect_stdout(tee):
-            func(cfg)
+            func(cfg, **kwargs)
     print(f"\nCompleted run. Output saved to {output_path}")
 
 
@@ -106,6 +106,11 @@ if __name__ == "__main__":
         action="store_true",
         help="Run all experiments"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore cached simulation results and re-run (Experiment 1)"
+    )
     parser.add_argument(
         "--demo",
         action="store_true",
@@ -114,8 +119,7 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    with open("configs/base.yaml") as f:
-        cfg = yaml.safe_load(f)
+    cfg = load_config("configs/base.yaml")
     
     if args.demo:
         run_quick_demo(cfg)
@@ -125,7 +129,8 @@ if __name__ == "__main__":
             2: ("experiment2_output.txt", run_experiment_2),
         }
         filename, func = experiment_map[args.experiment]
-        run_with_logging(filename, func, cfg)
+        func_kwargs = {"force": args.force} if args.experiment == 1 else {}
+        run_with_logging(filename, func, cfg, **func_kwargs)
     elif args.all:
         # Create output directory if it doesn't exist
         project_root = os.path.dirname(os.path.abspath(__file__))
@@ -137,7 +142,7 @@ if __name__ == "__main__":
             tee = TeeStream(sys.stdout, outfile)
             with contextlib.redirect_stdout(tee):
                 print("Running all experiments...\n")
-                run_experiment_1(cfg)
+                run_experiment_1(cfg, force=args.force)
                 print("\n\n")
                 print("Running Experiment 2: 4-player table composition analysis...\n")
                 run_experiment_2(cfg)
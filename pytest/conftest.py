@@ -0,0 +1,17 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from mahjong_sim.tiles import Tile
+from mahjong_sim.hand import Hand
+
+
+@pytest.fixture
+def make_hand():
+    """Build a hand from (tile_type, value, copies) specs."""
+    def _make_hand(*specs):
+        hand = Hand()
+        for tile_type, value, copies in specs:
+            for _ in range(copies):
+                hand.add_tile(Tile(tile_type, value))
+        return hand
+    return _make_hand
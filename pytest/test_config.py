@@ -0,0 +1,27 @@
+"""Tests for mahjong_sim.config module."""
+
+from mahjong_sim.config import load_config, SimConfig
+
+
+def test_load_config_returns_copies(tmp_path):
+    """Test that cached loads return independent copies and track file changes."""
+    path = tmp_path / "cfg.yaml"
+    path.write_text("trials: 5\nstrategy_thresholds:\n  neutral_policy:\n    target_fan: 3\n")
+
+    cfg = load_config(str(path))
+    cfg["strategy_thresholds"]["neutral_policy"]["target_fan"] = 99
+
+    assert load_config(str(path)) == {"trials": 5, "strategy_thresholds": {"neutral_policy": {"target_fan": 3}}}
+
+    path.write_text("trials: 7\n")
+    assert load_config(str(path)) == {"trials": 7}
+
+
+def test_sim_config_from_dict():
+    """Test SimConfig defaults and overrides."""
+    sim_cfg = SimConfig.from_dict({"fan_min": 2, "risk_calculation": {"max_denominator": 50}, "accel": "python"})
+
+    assert sim_cfg.fan_min == 2
+    assert sim_cfg.t_fan_threshold == 3
+    assert sim_cfg.risk_max_denominator == 50
+    assert sim_cfg.accel == "python"
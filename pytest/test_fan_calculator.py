@@ -0,0 +1,32 @@
+"""Tests for mahjong_sim.fan_calculator module."""
+
+from mahjong_sim.tiles import Tile, TileType
+from mahjong_sim.fan_calculator import FanCalculator
+
+
+def test_calculate_fan_all_pongs_cached(make_hand):
+    """Test fan for a concealed all-pongs hand and that repeats hit the cache."""
+    hand = make_hand((TileType.WAN, 1, 3), (TileType.WAN, 5, 3), (TileType.TIAO, 9, 3),
+                 (TileType.TONG, 2, 3), (TileType.FENG, 1, 2))
+
+    # Self-draw (1) + concealed (1) + all pongs (2)
+    assert FanCalculator.calculate_fan(hand, is_self_draw=True, is_dealer=False) == 4
+
+    hits = FanCalculator._calculate_fan_cached.cache_info().hits
+    assert FanCalculator.calculate_fan(hand, is_self_draw=True, is_dealer=False) == 4
+    assert FanCalculator._calculate_fan_cached.cache_info().hits == hits + 1
+    assert FanCalculator.calculate_fan(hand, is_self_draw=False, is_dealer=False) == 3
+
+
+def test_gong_counted_once(make_hand):
+    """Test that a gong in both hand.melds and winning_melds is counted once."""
+    gong = [Tile(TileType.TONG, 7)] * 4
+    hand = make_hand((TileType.WAN, 2, 3), (TileType.WAN, 3, 3), (TileType.TIAO, 4, 3),
+                 (TileType.FENG, 2, 2))
+    hand.add_meld(list(gong))
+
+    winning_melds = [[Tile(TileType.WAN, 2)] * 3, [Tile(TileType.WAN, 3)] * 3,
+                     [Tile(TileType.TIAO, 4)] * 3, list(gong), [Tile(TileType.FENG, 2)] * 2]
+    summary = FanCalculator._summarize(hand, winning_melds)
+
+    assert summary.gong_count == 1
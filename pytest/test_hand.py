@@ -0,0 +1,136 @@
+"""Tests for mahjong_sim.hand and the count-vector kernels."""
+
+import pytest
+from mahjong_sim.tiles import Tile, TileType
+from mahjong_sim.kernels import form_melds, find_winning_pattern, is_complete_hand, meld_features
+from mahjong_sim.accel import resolve_accel
+
+
+def test_tile_index_round_trip():
+    """Test that Tile.from_index inverts Tile.index for all 34 tiles."""
+    for index in range(34):
+        assert Tile.from_index(index).index == index
+    assert Tile(TileType.WAN, 1).index == 0
+    assert Tile(TileType.JIAN, 3).index == 33
+
+
+def test_check_winning_hand(make_hand):
+    """Test a mixed pong/chi winning hand and a non-winning hand."""
+    hand = make_hand((TileType.WAN, 1, 1), (TileType.WAN, 2, 1), (TileType.WAN, 3, 1),
+                 (TileType.TIAO, 5, 3), (TileType.TONG, 7, 1), (TileType.TONG, 8, 1),
+                 (TileType.TONG, 9, 1), (TileType.FENG, 1, 3), (TileType.JIAN, 2, 2))
+    is_winning, melds = hand.check_winning_hand()
+
+    assert is_winning
+    assert len(melds) == 5
+    assert melds[-1] == [Tile(TileType.JIAN, 2), Tile(TileType.JIAN, 2)]
+
+    hand.remove_tile(Tile(TileType.TONG, 8))
+    hand.add_tile(Tile(TileType.FENG, 2))
+    assert not hand.check_winning_hand()[0]
+
+
+def test_hand_counts_track_tiles(make_hand):
+    """Test that Hand.counts follows add_tile/remove_tile and drives can_pong/can_chi."""
+    hand = make_hand((TileType.TIAO, 4, 2), (TileType.TIAO, 5, 1))
+    tiao4 = Tile(TileType.TIAO, 4)
+
+    assert hand.counts[tiao4.index] == 2
+    assert hand.can_pong(tiao4)
+    assert hand.can_chi(Tile(TileType.TIAO, 6)) == [[tiao4, Tile(TileType.TIAO, 5), Tile(TileType.TIAO, 6)]]
+    assert hand.chi_starts(Tile(TileType.TIAO, 3)) == [tiao4.index - 1]
+    assert hand.chi_starts(Tile(TileType.TONG, 6)) == []
+
+    assert hand.remove_tile(tiao4)
+    assert not hand.remove_tile(Tile(TileType.WAN, 1))
+    assert hand.counts[tiao4.index] == 1
+    assert not hand.can_pong(tiao4)
+
+
+def test_hand_tiles_built_from_counts(make_hand):
+    """Test that Hand.tiles is the sorted view of counts and is rebuilt after changes."""
+    hand = make_hand((TileType.TONG, 3, 1), (TileType.WAN, 7, 2))
+    wan7 = Tile(TileType.WAN, 7)
+
+    assert hand.tiles == [wan7, wan7, Tile(TileType.TONG, 3)]
+    hand.add_tile(Tile(TileType.WAN, 1))
+    assert hand.tiles[0] == Tile(TileType.WAN, 1)
+
+    hand.tiles = [Tile(TileType.JIAN, 2)]
+    assert hand.tiles == [Tile(TileType.JIAN, 2)]
+    assert sum(hand.counts) == 1
+
+
+def test_form_melds_prefers_triplets():
+    """Test that the kernel tries a triplet before a sequence."""
+    counts = [0] * 34
+    for index in (0, 1, 2):
+        counts[index] = 3
+    counts[27] = 3
+
+    assert form_melds(counts) == [0, 1, 2, 27]
+    assert counts[0] == 3  # input is not modified
+
+
+def test_find_winning_pattern_pair_order():
+    """Test that pair candidates are tried in the given order."""
+    # 111-222-333 wan + 999 tong + 55 tiao: 1 wan fails as the pair, 5 tiao works
+    counts = [0] * 34
+    for index in (0, 1, 2, 26):
+        counts[index] = 3
+    counts[13] = 2
+
+    assert find_winning_pattern(counts, [0, 13]) == (13, [0, 1, 2, 26])
+    assert find_winning_pattern(counts, [26]) is None
+    assert counts[13] == 2  # input is not modified
+
+
+def test_meld_features():
+    """Test triplet/sequence counts, mixed triple chi and little dragons."""
+    # 3-4-5 chi in all three suits + pong of red dragon, pair of east
+    mixed = [[2, 3, 4], [11, 12, 13], [20, 21, 22], [31, 31, 31], [27, 27]]
+    assert meld_features(mixed) == [1, 3, 1, 0]
+
+    # Two dragon pongs (one as a gong) + pair of the third dragon
+    dragons = [[31, 31, 31, 31], [32, 32, 32], [0, 1, 2], [5, 5, 5], [33, 33]]
+    assert meld_features(dragons) == [3, 1, 0, 1]
+
+
+def test_resolve_accel_rejects_unknown():
+    """Test accel option validation."""
+    assert resolve_accel({"accel": "python"}) == "python"
+    assert resolve_accel({}) in ("numba", "python")
+    with pytest.raises(ValueError):
+        resolve_accel({"accel": "gpu"})
+
+
+def test_can_gong_after_upgrade(make_hand):
+    """Test that can_gong finds a Pong meld and stops matching it once upgraded."""
+    hand = make_hand((TileType.WAN, 9, 1))
+    wan9 = Tile(TileType.WAN, 9)
+    hand.add_meld([Tile(TileType.TIAO, 2)] * 3)
+    hand.add_meld([wan9] * 3)
+
+    assert hand.can_gong(wan9) == 1
+    assert hand.can_gong() == 1
+    assert hand.can_gong(Tile(TileType.TONG, 1)) is None
+
+    hand.remove_tile(wan9)
+    hand.upgrade_to_gong(1, wan9)
+    assert hand.melds[1] == (wan9,) * 4
+    assert hand.can_gong(wan9) is None
+
+
+def test_is_complete_hand_matches_search():
+    """Test the 14-tile table check against the pattern search."""
+    counts = [0] * 34
+    for index in (0, 1, 2, 3, 4, 5, 9, 9, 9, 20, 21, 22, 30, 30):
+        counts[index] += 1
+    assert is_complete_hand(counts)
+    assert find_winning_pattern(counts, [9, 30]) is not None
+
+    # Swap one tile so the second wan sequence breaks
+    counts[5] -= 1
+    counts[6] += 1
+    assert not is_complete_hand(counts)
+    assert find_winning_pattern(counts, [9, 30]) is None
@@ -0,0 +1,34 @@
+"""Tests for mahjong_sim.parallel module."""
+
+from mahjong_sim.parallel import resolve_num_workers, trial_seeds, run_parallel
+
+
+def _square(x):
+    return x * x
+
+
+def test_trial_seeds_reproducible():
+    """Test that a fixed master seed gives the same per-trial seeds."""
+    cfg = {"seed": 42}
+    seeds = trial_seeds(cfg, 5)
+
+    assert seeds.shape == (5,)
+    assert (seeds == trial_seeds(cfg, 5)).all()
+    assert len(set(seeds.tolist())) == 5
+    assert trial_seeds(cfg, 5, seeds_per_trial=4).shape == (5, 4)
+
+
+def test_resolve_num_workers():
+    """Test worker count resolution from config."""
+    assert resolve_num_workers({"num_workers": 3}) == 3
+    assert resolve_num_workers({"num_workers": None}) >= 1
+    assert resolve_num_workers({}) >= 1
+
+
+def test_run_parallel_preserves_order():
+    """Test that results come back in task order, serial or pooled."""
+    tasks = list(range(10))
+    expected = [x * x for x in tasks]
+
+    assert run_parallel(_square, tasks, 1) == expected
+    assert run_parallel(_square, tasks, 2) == expected
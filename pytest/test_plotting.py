@@ -0,0 +1,23 @@
+"""Tests for mahjong_sim.plotting module."""
+
+import numpy as np
+from mahjong_sim.plotting import save_scatter_plot, _linear_fit
+
+
+def test_linear_fit():
+    """Test the closed-form fit against a known line and a constant x."""
+    slope, intercept, r_squared = _linear_fit(np.array([0.0, 1.0, 2.0]), np.array([1.0, 3.0, 5.0]))
+
+    assert np.isclose(slope, 2.0)
+    assert np.isclose(intercept, 1.0)
+    assert np.isclose(r_squared, 1.0)
+    assert _linear_fit(np.array([1.0, 1.0]), np.array([2.0, 3.0])) is None
+
+
+def test_save_scatter_plot_dual_fit(tmp_path):
+    """Test that fit lines are drawn for both series of a dual scatter plot."""
+    outfile = tmp_path / "scatter.png"
+    save_scatter_plot([1, 2, 3], [1, 2, 4], "Scatter", "x", "y", str(outfile), fit_line=True,
+                      x2=[1, 2, 3], y2=[3, 2, 1], label1="Defensive", label2="Aggressive")
+
+    assert outfile.exists()
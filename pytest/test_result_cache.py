@@ -0,0 +1,51 @@
+"""Tests for mahjong_sim.result_cache module and the experiment 1 result cache."""
+
+import numpy as np
+from mahjong_sim.result_cache import results_cache_key, load_results, save_results
+from mahjong_sim.strategies import TempoDefender, ValueChaser
+from experiments import run_experiment_1
+
+
+def test_save_load_round_trip(tmp_path):
+    """Test that arrays round-trip and 0-d arrays come back as scalars."""
+    save_results(str(tmp_path), "key", {"profits": np.array([1.0, -2.0]), "mean_fan": 2.5})
+    loaded = load_results(str(tmp_path), "key")
+
+    assert (loaded["profits"] == np.array([1.0, -2.0])).all()
+    assert loaded["mean_fan"] == 2.5
+    assert not isinstance(loaded["mean_fan"], np.ndarray)
+    assert load_results(str(tmp_path), "missing") is None
+
+
+def test_results_cache_key_changes():
+    """Test that the key depends on cfg and the strategy class."""
+    key = results_cache_key({"trials": 5}, TempoDefender)
+
+    assert results_cache_key({"trials": 5}, TempoDefender) == key
+    assert results_cache_key({"trials": 6}, TempoDefender) != key
+    assert results_cache_key({"trials": 5}, ValueChaser) != key
+
+
+def test_load_or_summarize_strategies(tmp_path, monkeypatch):
+    """Test that only uncached labels are simulated, and all of them with force=True."""
+    calls = []
+
+    def fake_summarize(test_labels, cfg):
+        calls.append(list(test_labels))
+        return {label: {"profit": np.array([float(len(calls))])} for label in test_labels}
+
+    monkeypatch.setattr(run_experiment_1, "summarize_strategies", fake_summarize)
+    cfg = {"trials": 2, "t_fan_threshold": 3}
+    cache_dir = str(tmp_path)
+
+    run_experiment_1.load_or_summarize_strategies(["DEF"], cfg, cache_dir)
+    results = run_experiment_1.load_or_summarize_strategies(["DEF", "AGG"], cfg, cache_dir)
+
+    assert calls == [["DEF"], ["AGG"]]
+    assert results["DEF"]["profit"][0] == 1.0  # Loaded from the first run's cache
+    assert results["AGG"]["profit"][0] == 2.0
+
+    results = run_experiment_1.load_or_summarize_strategies(["DEF", "AGG"], cfg, cache_dir, force=True)
+
+    assert calls[-1] == ["DEF", "AGG"]
+    assert results["DEF"]["profit"][0] == 3.0
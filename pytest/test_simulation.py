@@ -1,4 +1,5 @@
-from mahjong_sim.real_mc import run_simulation
+from mahjong_sim.real_mc import run_simulation, Player
+from mahjong_sim.players import NeutralPolicy
 from mahjong_sim.strategies import defensive_strategy
 
 
@@ -22,3 +23,12 @@ def test_simulation_runs():
     # Win rate should be less than 1.0 (not every hand is winnable)
     assert 0 <= result["win_rate"] <= 1.0
 
+
+def test_player_should_hu_rules():
+    """Test the Hu rule picked at construction for each kind of strategy."""
+    assert Player(0, "DEF").should_hu(1, fan_min=1, fan_threshold=3) is True
+    assert Player(0, "AGG").should_hu(2, fan_min=1, fan_threshold=3) is False
+    assert Player(0, "NEU").should_hu(2, risk=0.5) is True
+    assert Player(0, "NEU", NeutralPolicy(seed=None)).should_hu(1, risk=0.75) is True
+    assert Player(0, "custom", lambda fan: fan >= 5).should_hu(4) is False
+    assert Player(0, "custom").should_hu(1) is True
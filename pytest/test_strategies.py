@@ -1,6 +1,8 @@
 """Tests for mahjong_sim.strategies module."""
 
-from mahjong_sim.strategies import defensive_strategy, aggressive_strategy
+from mahjong_sim.strategies import defensive_strategy, aggressive_strategy, ValueChaser, TableState
+from mahjong_sim.hand import Hand
+from mahjong_sim.tiles import Tile, TileType
 
 
 def test_defensive_strategy_accepts_min_fan():
@@ -43,3 +45,14 @@ def test_strategies_with_float_fan():
     assert defensive_strategy(fan=1.5, fan_min=1) is True
     assert aggressive_strategy(fan=3.5, threshold=3) is True
 
+
+def test_value_chaser_penalizes_off_suit_when_wan_dominant():
+    """Test ValueChaser's suit penalty applies when wan (TileType value 0) is dominant."""
+    hand = Hand()
+    for index in [0, 0, 0, 2, 2, 3, 3, 6, 14, 14, 21, 33, 33, 33]:
+        hand.add_tile(Tile.from_index(index))
+
+    discard = ValueChaser().choose_discard(hand, TableState([], 60, 10, 0.0, None, 0))
+
+    # Without the penalty the isolated wan 7 goes; with it, the isolated tong 4
+    assert discard == Tile(TileType.TONG, 4)
@@ -60,6 +60,18 @@ def test_compare_strategies():
     assert "aggressive" in comparison["profit"]
 
 
+def test_compare_strategies_arrays():
+    """Test compare_strategies with plain profit arrays (Welch t-test)."""
+    profits_def = np.array([10.0, 20.0, 30.0, 40.0])
+    profits_agg = np.array([0.0, 50.0, 5.0, 60.0])
+    
+    comparison = compare_strategies(profits_def, profits_agg)
+    
+    assert comparison["profit"]["difference"] == pytest.approx(-3.75)
+    assert comparison == compare_strategies({"profits": profits_def}, {"profits": profits_agg})
+    assert 0.0 <= comparison["profit"]["p_value"] <= 1.0
+
+
 def test_analyze_composition_effect():
     """Test analyze_composition_effect function."""
     theta_values = [0.0, 0.5, 1.0]